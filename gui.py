@@ -4,11 +4,13 @@ GUI for Photo Metadata Editor.
 macOS/Linux/Windows compatible.
 """
 
+import os
 import sys
 import json
 import shutil
 import logging
-import traceback
+import threading
+from collections import OrderedDict, deque
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List, Any
@@ -16,17 +18,136 @@ from typing import Optional, Dict, List, Any
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QFileDialog, QListWidget, QListWidgetItem, QTextEdit, QDialog, QSplitter,
-    QProgressDialog, QMessageBox, QAbstractItemView, QLineEdit, QTableWidget, 
-    QTableWidgetItem, QCheckBox, QGroupBox, QFormLayout, QTabWidget, QToolBar, QSizePolicy
+    QProgressDialog, QMessageBox, QAbstractItemView, QLineEdit, QTableView,
+    QCheckBox, QGroupBox, QFormLayout, QTabWidget, QToolBar, QSizePolicy, QToolTip
+)
+from PySide6.QtCore import (
+    Qt, QSize, QMimeData, QPoint, QItemSelectionModel, Signal, QObject, QThread, QTimer,
+    QAbstractTableModel, QModelIndex, QRunnable, QThreadPool, QEvent
+)
+from PySide6.QtGui import (
+    QIcon, QColor, QDragEnterEvent, QDropEvent, QFont, QPixmap, QImage, QImageReader, QImageIOHandler, QCursor
 )
-from PySide6.QtCore import Qt, QSize, QMimeData, QPoint, QItemSelectionModel, Signal, QObject
-from PySide6.QtGui import QIcon, QColor, QDragEnterEvent, QDropEvent, QFont, QPixmap
 
 from metadata_handler import MetadataManager, TemplateManager, NamingEngine
 from update_checker import UpdateChecker
 
 logger = logging.getLogger(__name__)
 
+# Pattern shown as the naming placeholder and previewed while the pattern is empty
+DEFAULT_NAMING_PATTERN = "{userid}_{date}_{original_name}"
+# (token, button label) pairs for the NamingDialog quick-insert toolbar
+NAMING_TOKEN_BUTTONS = (
+    ("{date}", "Date"),
+    ("{datetime:%Y%m%d_%H%M%S}", "DateTime"),
+    ("{title}", "Title"),
+    ("{camera_model}", "Camera"),
+    ("{sequence:03d}", "Seq(3)"),
+    ("{sequence:04d}", "Seq(4)"),
+    ("{original_name}", "Original"),
+    ("{userid}", "User"),
+)
+NAMING_TOKENS_HELP = ("Tokens: {date}, {datetime:%Y%m%d_%H%M%S}, {title}, {camera_model}, "
+                      "{sequence:NNd}, {original_name}, {userid}")
+# Open-dialog options that skip per-entry icon lookups and symlink resolution,
+# which dominate listing time in large or network-mounted folders
+OPEN_DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons | QFileDialog.Option.DontResolveSymlinks
+# Metadata entries listed in the image preview's tooltip
+EXIF_TOOLTIP_KEYS = ('Artist', 'Model', 'DateTime', 'ImageDescription')
+XMP_TOOLTIP_KEYS = ('dc:creator', 'dc:description')
+# Default macOS and Windows filesystems treat names differing only in case as one file
+CASE_INSENSITIVE_NAMES = sys.platform in ('darwin', 'win32')
+# Name filter for picking images; plain suffix globs need no mime database lookups
+IMAGE_FILE_FILTER = "Image Files (*.jpg *.jpeg *.tiff *.tif *.png);;All Files (*)"
+
+# Stylesheets shared by several widgets, so each string is built once
+TOKEN_BUTTONS_STYLE = "QPushButton { font-size: 11px; padding: 2px 6px; }"
+HINT_LABEL_STYLE = "color: #666; font-size: 10px;"
+TOOLBAR_BUTTON_STYLE = "padding: 2px; font-size: 13px;"
+UPDATE_AVAILABLE_STYLE = "padding: 2px; font-size: 14px; background-color: #ff9800; color: white; border-radius: 4px;"
+APPLY_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #28a745;
+        color: white;
+        font-weight: bold;
+        font-size: 16px;
+        padding: 15px;
+    }
+"""
+
+
+class MetadataTableModel(QAbstractTableModel):
+    """
+    Two-column (key, value) model over a plain list of rows.
+    Rows are added and reset in bulk, so filling a table costs one view
+    notification instead of one per cell.
+    """
+    
+    # Longer values (e.g. byte blobs such as MakerNote) are cut for display only
+    MAX_DISPLAY_CHARS = 4096
+    
+    def __init__(self, headers: List[str], rows=(), editable: bool = False, parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._rows = [[key, value] for key, value in rows]
+        self._editable = editable
+    
+    def rows(self) -> List[List[str]]:
+        return self._rows
+    
+    def append_rows(self, rows):
+        rows = [[key, value] for key, value in rows]
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._rows[index.row()][index.column()]
+            if len(value) > self.MAX_DISPLAY_CHARS:
+                return value[:self.MAX_DISPLAY_CHARS] + '…'
+            return value
+        if role == Qt.ItemDataRole.EditRole:
+            return self._rows[index.row()][index.column()]
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index):
+        flags = super().flags(index)
+        if self._editable:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        self._rows[index.row()][index.column()] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        if parent.isValid() or row < 0 or count <= 0 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
 
 class TemplateDialog(QDialog):
     """Dialog for creating/editing templates."""
@@ -62,8 +183,9 @@ class TemplateDialog(QDialog):
         layout.addLayout(name_layout)
         
         layout.addWidget(QLabel("EXIF Tags:"))
-        self.exif_table = QTableWidget(0, 2)
-        self.exif_table.setHorizontalHeaderLabels(["Tag", "Value"])
+        self.exif_model = MetadataTableModel(["Tag", "Value"], editable=True, parent=self)
+        self.exif_table = QTableView()
+        self.exif_table.setModel(self.exif_model)
         layout.addWidget(self.exif_table)
         
         exif_btn_layout = QHBoxLayout()
@@ -76,8 +198,9 @@ class TemplateDialog(QDialog):
         layout.addLayout(exif_btn_layout)
         
         layout.addWidget(QLabel("XMP Properties:"))
-        self.xmp_table = QTableWidget(0, 2)
-        self.xmp_table.setHorizontalHeaderLabels(["Property", "Value"])
+        self.xmp_model = MetadataTableModel(["Property", "Value"], editable=True, parent=self)
+        self.xmp_table = QTableView()
+        self.xmp_table.setModel(self.xmp_model)
         layout.addWidget(self.xmp_table)
         
         xmp_btn_layout = QHBoxLayout()
@@ -109,39 +232,37 @@ class TemplateDialog(QDialog):
         self.add_xmp_row()
     
     def add_exif_row(self):
-        row = self.exif_table.rowCount()
-        self.exif_table.insertRow(row)
-        self.exif_table.setItem(row, 0, QTableWidgetItem(""))
-        self.exif_table.setItem(row, 1, QTableWidgetItem(""))
+        self.exif_model.append_rows([("", "")])
     
     def add_xmp_row(self):
-        row = self.xmp_table.rowCount()
-        self.xmp_table.insertRow(row)
-        self.xmp_table.setItem(row, 0, QTableWidgetItem(""))
-        self.xmp_table.setItem(row, 1, QTableWidgetItem(""))
+        self.xmp_model.append_rows([("", "")])
     
-    def remove_row(self, table: QTableWidget):
-        current_row = table.currentRow()
+    def remove_row(self, table: QTableView):
+        current_row = table.currentIndex().row()
         if current_row >= 0:
-            table.removeRow(current_row)
+            table.model().removeRow(current_row)
+    
+    def fill_tables(self, template: Dict):
+        """Append a template's EXIF and XMP entries to the tables."""
+        self.exif_model.append_rows((tag, str(value)) for tag, value in template.get('exif', {}).items())
+        self.xmp_model.append_rows((prop, str(value)) for prop, value in template.get('xmp', {}).items())
     
     def load_template(self, template_name: str):
-        templates = self.template_manager.get_templates()
-        if template_name in templates:
-            template = templates[template_name]
+        template = self.template_manager.get_template(template_name)
+        if template is not None:
             self.name_input.setText(template_name)
-            
-            for tag, value in template.get('exif', {}).items():
-                row = self.exif_table.rowCount()
-                self.exif_table.insertRow(row)
-                self.exif_table.setItem(row, 0, QTableWidgetItem(tag))
-                self.exif_table.setItem(row, 1, QTableWidgetItem(str(value)))
-            
-            for prop, value in template.get('xmp', {}).items():
-                row = self.xmp_table.rowCount()
-                self.xmp_table.insertRow(row)
-                self.xmp_table.setItem(row, 0, QTableWidgetItem(prop))
-                self.xmp_table.setItem(row, 1, QTableWidgetItem(str(value)))
+            self.fill_tables(template)
+    
+    @staticmethod
+    def _filled_rows(model: MetadataTableModel) -> Dict[str, str]:
+        """Return the model's rows as a dict, stripping each cell once and skipping blanks."""
+        data = {}
+        for key, value in model.rows():
+            key = key.strip()
+            value = value.strip()
+            if key and value:
+                data[key] = value
+        return data
     
     def save_template(self):
         name = self.name_input.text().strip()
@@ -149,19 +270,8 @@ class TemplateDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please enter a template name.")
             return
         
-        exif_data = {}
-        for row in range(self.exif_table.rowCount()):
-            tag = self.exif_table.item(row, 0)
-            value = self.exif_table.item(row, 1)
-            if tag and value and tag.text().strip() and value.text().strip():
-                exif_data[tag.text().strip()] = value.text().strip()
-        
-        xmp_data = {}
-        for row in range(self.xmp_table.rowCount()):
-            prop = self.xmp_table.item(row, 0)
-            value = self.xmp_table.item(row, 1)
-            if prop and value and prop.text().strip() and value.text().strip():
-                xmp_data[prop.text().strip()] = value.text().strip()
+        exif_data = self._filled_rows(self.exif_model)
+        xmp_data = self._filled_rows(self.xmp_model)
         
         if not exif_data and not xmp_data:
             QMessageBox.warning(self, "Error", "Please add at least one EXIF tag or XMP property.")
@@ -171,28 +281,22 @@ class TemplateDialog(QDialog):
             # Check if renaming
             new_name = self.rename_input.text().strip() if hasattr(self, 'rename_input') else ""
             if new_name and new_name != name:
-                if self.template_manager.get_templates().get(new_name):
+                if self.template_manager.get_template(new_name):
                     QMessageBox.warning(self, "Error", f"Template '{new_name}' already exists.")
                     return
-                # Delete old, save as new name
-                if self.template_manager.delete_template(name):
-                    if self.template_manager.save_template(new_name, exif_data, xmp_data):
-                        QMessageBox.information(self, "Success", f"Template renamed to '{new_name}' and updated!")
-                        self.accept()
-                    else:
-                        QMessageBox.critical(self, "Error", "Failed to save renamed template.")
+                # Save under the new name and drop the old one in one manager call
+                if self.template_manager.update_template(name, new_name, exif_data, xmp_data):
+                    QMessageBox.information(self, "Success", f"Template renamed to '{new_name}' and updated!")
+                    self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "Failed to rename template.")
+                    QMessageBox.critical(self, "Error", "Failed to save renamed template.")
             else:
                 # Update existing
-                if self.template_manager.delete_template(name):
-                    if self.template_manager.save_template(name, exif_data, xmp_data):
-                        QMessageBox.information(self, "Success", f"Template '{name}' updated!")
-                        self.accept()
-                    else:
-                        QMessageBox.critical(self, "Error", "Failed to save template.")
+                if self.template_manager.update_template(name, name, exif_data, xmp_data):
+                    QMessageBox.information(self, "Success", f"Template '{name}' updated!")
+                    self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "Failed to update template.")
+                    QMessageBox.critical(self, "Error", "Failed to save template.")
         else:
             if self.template_manager.save_template(name, exif_data, xmp_data):
                 QMessageBox.information(self, "Success", f"Template '{name}' saved!")
@@ -203,13 +307,12 @@ class TemplateDialog(QDialog):
     def export_template(self):
         """Export template as JSON file."""
         name = self.name_input.text().strip()
-        templates = self.template_manager.get_templates()
+        template_data = self.template_manager.get_template(name)
         
-        if name not in templates:
+        if template_data is None:
             QMessageBox.warning(self, "Error", f"Template '{name}' not found.")
             return
         
-        template_data = templates[name]
         export_data = {
             "name": name,
             "exif": template_data.get("exif", {}),
@@ -222,8 +325,7 @@ class TemplateDialog(QDialog):
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(export_data, f, indent=2)
+                self.template_manager._write_json(Path(file_path), export_data)
                 QMessageBox.information(self, "Success", f"Template exported to {Path(file_path).name}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export template: {str(e)}")
@@ -232,10 +334,16 @@ class TemplateDialog(QDialog):
 class ImportDialog(QDialog):
     """Dialog for importing templates or naming conventions."""
     
+    # Largest JSON accepted; templates are a few KB, and bigger input would stall the UI
+    MAX_IMPORT_BYTES = 4 * 1024 * 1024
+    
     def __init__(self, import_type: str, parent=None):
         super().__init__(parent)
         self.import_type = import_type
         self.import_data = None
+        # Bytes of the selected file, parsed directly unless the text is edited
+        self._file_bytes = None
+        self._file_text = None
         self.init_ui()
     
     def init_ui(self):
@@ -276,13 +384,20 @@ class ImportDialog(QDialog):
     
     def select_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select JSON File", "", "JSON Files (*.json);;All Files (*)"
+            self, "Select JSON File", "", "JSON Files (*.json);;All Files (*)",
+            options=OPEN_DIALOG_OPTIONS
         )
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    self.json_text.setPlainText(f.read())
+                if os.path.getsize(file_path) > self.MAX_IMPORT_BYTES:
+                    QMessageBox.critical(self, "Error", self._too_large_message())
+                    return
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                self.json_text.setPlainText(data.decode('utf-8', errors='replace'))
+                self._file_bytes = data
+                self._file_text = self.json_text.toPlainText()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to read file: {str(e)}")
     
@@ -293,8 +408,17 @@ class ImportDialog(QDialog):
             QMessageBox.warning(self, "No Data", "Please select a file or paste JSON.")
             return
         
+        # Characters, not bytes, but close enough to catch a runaway paste
+        if len(json_text) > self.MAX_IMPORT_BYTES:
+            QMessageBox.critical(self, "Error", self._too_large_message())
+            return
+        
         try:
-            self.import_data = json.loads(json_text)
+            if self._file_bytes is not None and self.json_text.toPlainText() == self._file_text:
+                # Unedited file contents: parse the raw bytes, skipping the str round trip
+                self.import_data = TemplateManager._parse_json(self._file_bytes)
+            else:
+                self.import_data = TemplateManager._parse_json(json_text)
             
             if self.import_type == 'template':
                 if 'name' not in self.import_data:
@@ -309,6 +433,9 @@ class ImportDialog(QDialog):
             QMessageBox.critical(self, "Invalid JSON", f"Failed to parse JSON: {str(e)}")
         except ValueError as e:
             QMessageBox.critical(self, "Invalid Format", str(e))
+    
+    def _too_large_message(self) -> str:
+        return f"JSON is too large to import (limit {self.MAX_IMPORT_BYTES // (1024 * 1024)} MB)."
 
 
 class NamingDialog(QDialog):
@@ -347,33 +474,26 @@ class NamingDialog(QDialog):
         pattern_layout = QHBoxLayout()
         pattern_layout.addWidget(QLabel("Pattern:"))
         self.pattern_input = QLineEdit()
-        self.pattern_input.setPlaceholderText("{userid}_{date}_{original_name}")
+        self.pattern_input.setPlaceholderText(DEFAULT_NAMING_PATTERN)
         pattern_layout.addWidget(self.pattern_input)
         layout.addLayout(pattern_layout)
 
         # Quick insert tokens toolbar
-        tokens_bar = QHBoxLayout()
-        tokens = [
-            ("{date}", "Date"),
-            ("{datetime:%Y%m%d_%H%M%S}", "DateTime"),
-            ("{title}", "Title"),
-            ("{camera_model}", "Camera"),
-            ("{sequence:03d}", "Seq(3)"),
-            ("{sequence:04d}", "Seq(4)"),
-            ("{original_name}", "Original"),
-            ("{userid}", "User"),
-        ]
-        for token, label in tokens:
+        # One stylesheet on the container is parsed once for all the buttons
+        tokens_widget = QWidget()
+        tokens_widget.setStyleSheet(TOKEN_BUTTONS_STYLE)
+        tokens_bar = QHBoxLayout(tokens_widget)
+        tokens_bar.setContentsMargins(0, 0, 0, 0)
+        for token, label in NAMING_TOKEN_BUTTONS:
             btn = QPushButton(label)
             btn.setFixedHeight(24)
-            btn.setStyleSheet("font-size: 11px; padding: 2px 6px;")
             btn.clicked.connect(lambda _, t=token: self._insert_token(t))
             tokens_bar.addWidget(btn)
-        layout.addLayout(tokens_bar)
+        layout.addWidget(tokens_widget)
         
-        info = QLabel("Tokens: {date}, {datetime:%Y%m%d_%H%M%S}, {title}, {camera_model}, {sequence:NNd}, {original_name}, {userid}")
+        info = QLabel(NAMING_TOKENS_HELP)
         info.setWordWrap(True)
-        info.setStyleSheet("color: #666; font-size: 10px;")
+        info.setStyleSheet(HINT_LABEL_STYLE)
         layout.addWidget(info)
 
         # Live preview
@@ -416,7 +536,7 @@ class NamingDialog(QDialog):
     def update_preview_example(self):
         """Update preview based on current pattern using sample metadata."""
         try:
-            pattern = self.pattern_input.text().strip() or "{userid}_{date}_{original_name}"
+            pattern = self.pattern_input.text().strip() or DEFAULT_NAMING_PATTERN
             # Try to use a selected file from parent window, else dummy path
             file_path = None
             parent = self.parent()
@@ -425,25 +545,24 @@ class NamingDialog(QDialog):
             if not file_path:
                 file_path = str(Path.home() / "Pictures" / "example.jpg")
 
-            # Sample metadata: use parent metadata manager if available
+            # Sample metadata: use parent metadata manager if available, and only
+            # when the pattern has a token that reads it
             metadata = {'exif': {}, 'xmp': {}}
-            if parent and hasattr(parent, "metadata_manager"):
+            if parent and hasattr(parent, "metadata_manager") and NamingEngine.uses_metadata(pattern):
                 try:
-                    metadata = parent.metadata_manager.get_metadata(file_path)
+                    metadata = parent.metadata_manager.get_metadata(file_path, tags=NamingEngine.METADATA_TAGS)
                 except Exception:
                     metadata = {'exif': {}, 'xmp': {}}
 
-            from metadata_handler import NamingEngine
-            engine = NamingEngine()
+            engine = getattr(parent, "naming_engine", None) or NamingEngine()
             preview = engine.generate_filename(pattern, file_path, metadata, 1)
             self.preview_output.setText(preview)
         except Exception:
             self.preview_output.setText("")
     
     def load_naming(self, naming_name: str):
-        namings = self.template_manager.get_naming_conventions()
-        if naming_name in namings:
-            naming = namings[naming_name]
+        naming = self.template_manager.get_naming_convention(naming_name)
+        if naming is not None:
             self.name_input.setText(naming_name)
             self.pattern_input.setText(naming.get('pattern', ''))
     
@@ -459,28 +578,22 @@ class NamingDialog(QDialog):
             # Check if renaming
             new_name = self.rename_input.text().strip() if hasattr(self, 'rename_input') else ""
             if new_name and new_name != name:
-                if self.template_manager.get_naming_conventions().get(new_name):
+                if self.template_manager.get_naming_convention(new_name):
                     QMessageBox.warning(self, "Error", f"Naming convention '{new_name}' already exists.")
                     return
-                # Delete old, save as new name
-                if self.template_manager.delete_naming(name):
-                    if self.template_manager.save_naming(new_name, pattern):
-                        QMessageBox.information(self, "Success", f"Naming convention renamed to '{new_name}' and updated!")
-                        self.accept()
-                    else:
-                        QMessageBox.critical(self, "Error", "Failed to save renamed convention.")
+                # Save under the new name and drop the old one in one manager call
+                if self.template_manager.update_naming(name, new_name, pattern):
+                    QMessageBox.information(self, "Success", f"Naming convention renamed to '{new_name}' and updated!")
+                    self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "Failed to rename convention.")
+                    QMessageBox.critical(self, "Error", "Failed to save renamed convention.")
             else:
                 # Update existing
-                if self.template_manager.delete_naming(name):
-                    if self.template_manager.save_naming(name, pattern):
-                        QMessageBox.information(self, "Success", f"Naming convention '{name}' updated!")
-                        self.accept()
-                    else:
-                        QMessageBox.critical(self, "Error", "Failed to save.")
+                if self.template_manager.update_naming(name, name, pattern):
+                    QMessageBox.information(self, "Success", f"Naming convention '{name}' updated!")
+                    self.accept()
                 else:
-                    QMessageBox.critical(self, "Error", "Failed to update.")
+                    QMessageBox.critical(self, "Error", "Failed to save.")
         else:
             if self.template_manager.save_naming(name, pattern):
                 QMessageBox.information(self, "Success", f"Naming convention '{name}' saved!")
@@ -491,13 +604,12 @@ class NamingDialog(QDialog):
     def export_naming(self):
         """Export naming convention as JSON file."""
         name = self.name_input.text().strip()
-        namings = self.template_manager.get_naming_conventions()
+        naming_data = self.template_manager.get_naming_convention(name)
         
-        if name not in namings:
+        if naming_data is None:
             QMessageBox.warning(self, "Error", f"Naming convention '{name}' not found.")
             return
         
-        naming_data = namings[name]
         export_data = {
             "name": name,
             "pattern": naming_data.get("pattern", "")
@@ -509,8 +621,7 @@ class NamingDialog(QDialog):
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(export_data, f, indent=2)
+                self.template_manager._write_json(Path(file_path), export_data)
                 QMessageBox.information(self, "Success", f"Naming convention exported to {Path(file_path).name}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export naming convention: {str(e)}")
@@ -534,27 +645,13 @@ class MetadataViewDialog(QDialog):
         tabs = QTabWidget()
         
         # EXIF tab
-        exif_table = QTableWidget()
-        exif_table.setColumnCount(2)
-        exif_table.setHorizontalHeaderLabels(["Tag", "Value"])
         exif_data = self.metadata.get('exif', {})
-        exif_table.setRowCount(len(exif_data))
-        for row, (tag, value) in enumerate(exif_data.items()):
-            exif_table.setItem(row, 0, QTableWidgetItem(str(tag)))
-            exif_table.setItem(row, 1, QTableWidgetItem(str(value)[:200]))
-        exif_table.resizeColumnsToContents()
+        exif_table = self._make_table(["Tag", "Value"], exif_data)
         tabs.addTab(exif_table, "EXIF")
         
         # XMP tab
-        xmp_table = QTableWidget()
-        xmp_table.setColumnCount(2)
-        xmp_table.setHorizontalHeaderLabels(["Property", "Value"])
         xmp_data = self.metadata.get('xmp', {})
-        xmp_table.setRowCount(len(xmp_data))
-        for row, (prop, value) in enumerate(xmp_data.items()):
-            xmp_table.setItem(row, 0, QTableWidgetItem(str(prop)))
-            xmp_table.setItem(row, 1, QTableWidgetItem(str(value)[:200]))
-        xmp_table.resizeColumnsToContents()
+        xmp_table = self._make_table(["Property", "Value"], xmp_data)
         tabs.addTab(xmp_table, "XMP")
 
         # JSON tab
@@ -577,25 +674,285 @@ class MetadataViewDialog(QDialog):
         layout.addWidget(close_btn)
         
         self.setLayout(layout)
+    
+    def _make_table(self, headers: List[str], data: Dict) -> QTableView:
+        """Read-only key/value table; long values are elided by the view as it paints."""
+        table = QTableView()
+        table.setModel(MetadataTableModel(headers, ((str(k), str(v)) for k, v in data.items()), parent=self))
+        table.setWordWrap(False)
+        table.setTextElideMode(Qt.TextElideMode.ElideRight)
+        table.resizeColumnToContents(0)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+
+class BatchApplyWorker(QThread):
+    """
+    Reads metadata, generates names, writes the template and renames the written
+    files for a batch off the UI thread.
+    """
+    
+    progress = Signal(int, str)
+    # One status-log line per file
+    log = Signal(str)
+    # {path: write succeeded} (None when cancelled before any file was processed),
+    # {old path: new path}, number of files that succeeded
+    batch_done = Signal(object, object, int)
+    failed = Signal(str)
+    
+    def __init__(self, metadata_manager: MetadataManager, naming_engine: NamingEngine, files: List[str],
+                 pattern: str, exif: Dict, xmp: Dict, merge: bool, dry_run: bool, parent=None):
+        super().__init__(parent)
+        self.metadata_manager = metadata_manager
+        self.naming_engine = naming_engine
+        self.files = files
+        self.pattern = pattern
+        self.exif = exif
+        self.xmp = xmp
+        self.merge = merge
+        self.dry_run = dry_run
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        self._cancel.set()
+    
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+    
+    def run(self):
+        try:
+            metadatas = None
+            # Patterns built only from dates, sequence numbers and file names skip the read
+            if NamingEngine.uses_metadata(self.pattern):
+                metadata_map = {}
+                reads = self.metadata_manager.iter_metadata_batch(self.files, tags=NamingEngine.METADATA_TAGS)
+                for done, (path, metadata) in enumerate(reads, 1):
+                    metadata_map[path] = metadata
+                    self.progress.emit(done, "Reading metadata...")
+                    if self._cancel.is_set():
+                        reads.close()
+                        self.batch_done.emit(None, {}, 0)
+                        return
+                metadatas = [metadata_map[f] for f in self.files]
+            new_filenames = self.naming_engine.generate_filenames(self.pattern, self.files, metadatas)
+            
+            write_results = {}
+            if not self.dry_run:
+                writes = self.metadata_manager.iter_set_metadata_batch(self.files, self.exif, self.xmp, self.merge)
+                for done, (path, ok) in enumerate(writes, 1):
+                    write_results[path] = ok
+                    self.progress.emit(done, "Writing metadata...")
+                    if self._cancel.is_set():
+                        writes.close()
+                        break
+            rename_map, success_count = self._rename_files(new_filenames, write_results)
+            self.batch_done.emit(write_results, rename_map, success_count)
+        except Exception as e:
+            logger.error(f"Batch apply failed: {e}", exc_info=True)
+            self.failed.emit(str(e))
+    
+    def _rename_files(self, new_filenames: List[str], write_results: Dict[str, bool]):
+        """
+        Move each written file to its generated name (or only report it on a dry run).
+        Each folder is listed once and names are checked against that listing, which
+        tracks the names the batch takes and frees, so two files never get the same
+        suffix even when the dry run leaves the first one unmoved.
+        """
+        success_count = 0
+        rename_map = {}
+        # folder -> set of name keys, or None when it cannot be listed
+        self._listings = {}
+        # Names taken by the batch in folders probed on disk
+        self._claimed = set()
+        
+        for done, (file_path, new_filename) in enumerate(zip(self.files, new_filenames), 1):
+            self.progress.emit(done, "Dry run..." if self.dry_run else "Renaming files...")
+            # Parsed once; the name and folder are used throughout the body and logs
+            src = Path(file_path)
+            folder = src.parent
+            try:
+                new_path = folder / new_filename
+                
+                if self._is_taken(new_path) and str(new_path) != file_path:
+                    base = new_path.stem
+                    ext = new_path.suffix
+                    counter = 1
+                    while self._is_taken(new_path):
+                        new_path = folder / f"{base}_{counter}{ext}"
+                        counter += 1
+                new_path_str = str(new_path)
+                
+                if not self.dry_run:
+                    if file_path not in write_results:
+                        self.log.emit(f"– Skipped (cancelled): {src.name}")
+                    elif write_results[file_path]:
+                        if new_path_str != file_path:
+                            try:
+                                # One rename syscall; shutil.move probes and may copy first
+                                os.replace(file_path, new_path_str)
+                            except OSError:
+                                shutil.move(file_path, new_path_str)
+                            rename_map[file_path] = new_path_str
+                            self._release(src)
+                        self._claim(new_path)
+                        success_count += 1
+                        self.log.emit(f"✓ {src.name} → {new_path.name}")
+                    else:
+                        self.log.emit(f"✗ Failed: {src.name}")
+                else:
+                    self._claim(new_path)
+                    self.log.emit(f"[DRY RUN] {src.name} → {new_path.name}")
+                    success_count += 1
+            
+            except Exception as e:
+                self.log.emit(f"✗ Error: {src.name} - {str(e)}")
+                logger.error(f"Error processing {file_path}: {e}", exc_info=True)
+        
+        return rename_map, success_count
+    
+    @staticmethod
+    def _name_key(name: str) -> str:
+        return name.casefold() if CASE_INSENSITIVE_NAMES else name
+    
+    def _listing(self, folder: Path) -> Optional[set]:
+        if folder not in self._listings:
+            try:
+                with os.scandir(folder) as entries:
+                    self._listings[folder] = {self._name_key(entry.name) for entry in entries}
+            except OSError:
+                self._listings[folder] = None
+        return self._listings[folder]
+    
+    def _is_taken(self, path: Path) -> bool:
+        names = self._listing(path.parent)
+        if names is None:
+            return path in self._claimed or path.exists()
+        return self._name_key(path.name) in names
+    
+    def _claim(self, path: Path):
+        names = self._listing(path.parent)
+        if names is None:
+            self._claimed.add(path)
+        else:
+            names.add(self._name_key(path.name))
+    
+    def _release(self, path: Path):
+        names = self._listing(path.parent)
+        if names is not None:
+            names.discard(self._name_key(path.name))
+
+
+class MetadataDeleteWorker(QThread):
+    """Strips metadata from a batch of files off the UI thread."""
+    
+    progress = Signal(int, str)
+    # {path: deleted}; paths missing from the dict were skipped by a cancel
+    batch_done = Signal(object)
+    failed = Signal(str)
+    
+    def __init__(self, metadata_manager: MetadataManager, files: List[str], parent=None):
+        super().__init__(parent)
+        self.metadata_manager = metadata_manager
+        self.files = files
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        self._cancel.set()
+    
+    def run(self):
+        try:
+            results = {}
+            deletes = self.metadata_manager.iter_delete_metadata_batch(self.files)
+            for done, (path, ok) in enumerate(deletes, 1):
+                results[path] = ok
+                self.progress.emit(done, "Deleting metadata...")
+                if self._cancel.is_set():
+                    deletes.close()
+                    break
+            self.batch_done.emit(results)
+        except Exception as e:
+            logger.error(f"Batch delete failed: {e}", exc_info=True)
+            self.failed.emit(str(e))
+
+
+class PreviewTooltipTask(QRunnable):
+    """Reads a previewed file's metadata on a pool thread and posts its tooltip back."""
+    
+    def __init__(self, editor: "PhotoMetadataEditor", request_id: int, file_path: str):
+        super().__init__()
+        self.editor = editor
+        self.request_id = request_id
+        self.file_path = file_path
+    
+    def run(self):
+        try:
+            metadata = self.editor.metadata_manager.get_metadata(self.file_path)
+        except Exception as e:
+            logger.warning(f"Tooltip metadata read failed for {self.file_path}: {e}")
+            metadata = {'exif': {}, 'xmp': {}}
+        self.editor._tooltip_ready.emit(self.request_id, self.editor._preview_tooltip(self.file_path, metadata))
 
 
 class PhotoMetadataEditor(QMainWindow):
     """Main application window."""
     
+    # Scaled previews kept for revisiting images with Next/Prev
+    PIXMAP_CACHE_SIZE = 32
+    # Delay before buffered status messages are written to the log, in ms
+    LOG_FLUSH_INTERVAL_MS = 50
+    # Quiet period after the last preview request before the preview is redrawn, in ms
+    PREVIEW_DEBOUNCE_MS = 50
+    # Raised by log_status off the UI thread so the flush is scheduled there
+    _log_pending = Signal()
+    # (request id, tooltip text) from a PreviewTooltipTask
+    _tooltip_ready = Signal(int, str)
+    # (callback, result) from the update checker's thread, delivered on the UI thread
+    _update_checked = Signal(object, object)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Photo Metadata Editor")
         self.setGeometry(100, 100, 1400, 900)
         
         self.metadata_manager = MetadataManager()
+        # A running batch is stopped first (slots run in connection order), so the
+        # manager's pool is not shut down under it; then the worker processes go too
+        QApplication.instance().aboutToQuit.connect(self._stop_batch_worker)
+        QApplication.instance().aboutToQuit.connect(self.metadata_manager.close)
         self.template_manager = TemplateManager()
         self.naming_engine = NamingEngine()
         self.update_checker = UpdateChecker()
         
         self.selected_files = []
+        # path -> position in selected_files, kept in step with the list
+        self._selected_index = {}
         self.selected_template = None
         self.selected_naming = None
         self.last_operation = None
+        self._batch_worker = None
+        self._batch_progress = None
+        # (path, mtime_ns, size, target width, target height) -> scaled QPixmap
+        self._pixmap_cache = OrderedDict()
+        # Status lines waiting for the next log flush
+        self._log_buffer = deque()
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_pending.connect(self._schedule_log_flush)
+        # One thread: a newer preview drops queued reads instead of running them alongside
+        self._tooltip_pool = QThreadPool(self)
+        self._tooltip_pool.setMaxThreadCount(1)
+        self._tooltip_request = 0
+        # Previewed file whose tooltip metadata has not been asked for yet
+        self._tooltip_path = None
+        self._tooltip_ready.connect(self._on_tooltip_ready)
+        self._update_checked.connect(self._on_update_checked)
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(self.PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self._render_preview)
+        # list widget -> names it was last synced to by _sync_list
+        self._synced_names = {}
         self.preview_index = 0
         self.update_available = False
         
@@ -635,7 +992,7 @@ class PhotoMetadataEditor(QMainWindow):
         info_btn.setToolTip("Help & Documentation")
         info_btn.setMaximumWidth(32)
         info_btn.setMaximumHeight(24)
-        info_btn.setStyleSheet("padding: 2px; font-size: 13px;")
+        info_btn.setStyleSheet(TOOLBAR_BUTTON_STYLE)
         info_btn.clicked.connect(self.open_documentation)
         toolbar.addWidget(info_btn)
 
@@ -644,7 +1001,7 @@ class PhotoMetadataEditor(QMainWindow):
         self.update_btn.setToolTip("Check for Updates")
         self.update_btn.setMaximumWidth(32)
         self.update_btn.setMaximumHeight(24)
-        self.update_btn.setStyleSheet("padding: 2px; font-size: 13px;")
+        self.update_btn.setStyleSheet(TOOLBAR_BUTTON_STYLE)
         self.update_btn.clicked.connect(self.handle_update)
         toolbar.addWidget(self.update_btn)
         
@@ -708,6 +1065,7 @@ class PhotoMetadataEditor(QMainWindow):
         self.image_preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.image_preview_label.setMinimumHeight(180)
         self.image_preview_label.setStyleSheet("border: 1px solid #ccc; background: #fafafa;")
+        self.image_preview_label.installEventFilter(self)
         preview_layout.addWidget(self.image_preview_label)
         
         nav_layout = QHBoxLayout()
@@ -786,15 +1144,7 @@ class PhotoMetadataEditor(QMainWindow):
         main_vertical.addLayout(main_layout)
         
         apply_btn = QPushButton("APPLY TEMPLATE & RENAME")
-        apply_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #28a745;
-                color: white;
-                font-weight: bold;
-                font-size: 16px;
-                padding: 15px;
-            }
-        """)
+        apply_btn.setStyleSheet(APPLY_BUTTON_STYLE)
         apply_btn.clicked.connect(self.apply_template)
         
         self.status_text = QTextEdit()
@@ -820,20 +1170,32 @@ class PhotoMetadataEditor(QMainWindow):
     
     def open_files(self):
         files, _ = QFileDialog.getOpenFileNames(
-            self, "Select Image Files", "",
-            "Image Files (*.jpg *.jpeg *.tiff *.tif *.png);;All Files (*)"
+            self, "Select Image Files", "", IMAGE_FILE_FILTER,
+            options=OPEN_DIALOG_OPTIONS
         )
         if files:
             self.add_files(files)
     
     def add_files(self, files: List[str]):
+        new_items = []
         for file in files:
-            if Path(file).exists() and Path(file).is_file():
-                if file not in self.selected_files:
+            # isfile is a single stat (and False for missing paths), and the
+            # basename needs no Path object
+            if os.path.isfile(file):
+                if file not in self._selected_index:
+                    self._selected_index[file] = len(self.selected_files)
                     self.selected_files.append(file)
-                    item = QListWidgetItem(Path(file).name)
+                    item = QListWidgetItem(os.path.basename(file))
                     item.setData(Qt.ItemDataRole.UserRole, file)
-                    self.file_list_widget.addItem(item)
+                    new_items.append(item)
+        
+        # Insert with repaints suspended so a large drop lays out and paints once
+        self.file_list_widget.setUpdatesEnabled(False)
+        try:
+            for item in new_items:
+                self.file_list_widget.addItem(item)
+        finally:
+            self.file_list_widget.setUpdatesEnabled(True)
         
         self.log_status(f"Added {len(files)} file(s)")
         self.preview_index = 0
@@ -841,6 +1203,7 @@ class PhotoMetadataEditor(QMainWindow):
     
     def clear_files(self):
         self.selected_files.clear()
+        self._selected_index.clear()
         self.file_list_widget.clear()
         self.preview_index = 0
         self.update_preview()
@@ -909,13 +1272,12 @@ class PhotoMetadataEditor(QMainWindow):
             return
         
         name = current_item.text()
-        templates = self.template_manager.get_templates()
+        template_data = self.template_manager.get_template(name)
         
-        if name not in templates:
+        if template_data is None:
             QMessageBox.warning(self, "Error", f"Template '{name}' not found.")
             return
         
-        template_data = templates[name]
         export_data = {
             "name": name,
             "exif": template_data.get("exif", {}),
@@ -928,8 +1290,7 @@ class PhotoMetadataEditor(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(export_data, f, indent=2)
+                self.template_manager._write_json(Path(file_path), export_data)
                 self.log_status(f"Template exported to {Path(file_path).name}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export template: {str(e)}")
@@ -942,13 +1303,12 @@ class PhotoMetadataEditor(QMainWindow):
             return
         
         name = current_item.text()
-        namings = self.template_manager.get_naming_conventions()
+        naming_data = self.template_manager.get_naming_convention(name)
         
-        if name not in namings:
+        if naming_data is None:
             QMessageBox.warning(self, "Error", f"Naming convention '{name}' not found.")
             return
         
-        naming_data = namings[name]
         export_data = {
             "name": name,
             "pattern": naming_data.get("pattern", "")
@@ -960,8 +1320,7 @@ class PhotoMetadataEditor(QMainWindow):
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(export_data, f, indent=2)
+                self.template_manager._write_json(Path(file_path), export_data)
                 self.log_status(f"Naming convention exported to {Path(file_path).name}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export naming convention: {str(e)}")
@@ -984,32 +1343,19 @@ class PhotoMetadataEditor(QMainWindow):
             return
         
         original_name = current_item.text()
-        templates = self.template_manager.get_templates()
+        original_template = self.template_manager.get_template(original_name)
         
-        if original_name not in templates:
+        if original_template is None:
             QMessageBox.warning(self, "Error", f"Template '{original_name}' not found.")
             return
         
-        # Get original template data
-        original_template = templates[original_name]
-        
         # Open dialog pre-filled with original data, but allow renaming
         dialog = TemplateDialog(self, self.template_manager)
         dialog.setWindowTitle(f"Duplicate Template: {original_name}")
         dialog.name_input.setText(f"{original_name} Copy")
         
         # Load original data into the dialog
-        for tag, value in original_template.get('exif', {}).items():
-            row = dialog.exif_table.rowCount()
-            dialog.exif_table.insertRow(row)
-            dialog.exif_table.setItem(row, 0, QTableWidgetItem(tag))
-            dialog.exif_table.setItem(row, 1, QTableWidgetItem(str(value)))
-        
-        for prop, value in original_template.get('xmp', {}).items():
-            row = dialog.xmp_table.rowCount()
-            dialog.xmp_table.insertRow(row)
-            dialog.xmp_table.setItem(row, 0, QTableWidgetItem(prop))
-            dialog.xmp_table.setItem(row, 1, QTableWidgetItem(str(value)))
+        dialog.fill_tables(original_template)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.refresh_templates()
@@ -1048,21 +1394,44 @@ class PhotoMetadataEditor(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please select at least one file.")
             return
         
+        if self._batch_worker is not None:
+            QMessageBox.information(self, "Info", "A batch is already being processed.")
+            return
+        
         if QMessageBox.question(self, "Confirm", f"Delete metadata from {len(self.selected_files)} file(s)?") != QMessageBox.StandardButton.Yes:
             return
         
-        progress = QProgressDialog("Deleting metadata...", None, 0, len(self.selected_files), self)
+        files = list(self.selected_files)
+        worker = MetadataDeleteWorker(self.metadata_manager, files, self)
+        self._start_batch(worker, "Deleting metadata...", len(files), self._on_delete_done)
+    
+    def _start_batch(self, worker: QThread, label: str, total: int, on_done):
+        """Show a cancellable progress dialog fed by worker's signals and start it."""
+        progress = QProgressDialog(label, "Cancel", 0, total, self)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
-        
-        success_count = 0
-        for i, file_path in enumerate(self.selected_files):
-            if self.metadata_manager.delete_metadata(file_path):
-                success_count += 1
-            progress.setValue(i + 1)
-            QApplication.processEvents()
-        
-        progress.close()
-        self.log_status(f"Metadata deletion complete: {success_count}/{len(self.selected_files)} successful")
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        
+        # The worker's signals are queued back to this thread, so the window keeps
+        # repainting without processEvents() calls
+        worker.progress.connect(self._on_batch_progress)
+        worker.batch_done.connect(on_done)
+        worker.failed.connect(self._on_batch_failed)
+        worker.finished.connect(worker.deleteLater)
+        progress.canceled.connect(worker.cancel)
+        self._batch_worker = worker
+        self._batch_progress = progress
+        progress.show()
+        worker.start()
+    
+    def _on_delete_done(self, results: Dict[str, bool]):
+        worker = self._end_batch()
+        success_count = sum(1 for ok in results.values() if ok)
+        self._drop_cached_previews(path for path, ok in results.items() if ok)
+        if len(results) < len(worker.files):
+            self.log_status(f"Metadata deletion cancelled: {success_count}/{len(worker.files)} successful")
+        else:
+            self.log_status(f"Metadata deletion complete: {success_count}/{len(worker.files)} successful")
     
     def on_template_selected(self):
         current_item = self.template_list.currentItem()
@@ -1077,55 +1446,162 @@ class PhotoMetadataEditor(QMainWindow):
             self.update_preview()
     
     def refresh_templates(self):
-        self.template_list.clear()
-        for name in self.template_manager.get_templates().keys():
-            self.template_list.addItem(name)
+        self._sync_list(self.template_list, self.template_manager.get_template_names())
     
     def refresh_namings(self):
-        self.naming_list.clear()
-        for name in self.template_manager.get_naming_conventions().keys():
-            self.naming_list.addItem(name)
+        self._sync_list(self.naming_list, self.template_manager.get_naming_names())
+    
+    def _sync_list(self, list_widget: QListWidget, names):
+        """
+        Bring list_widget in line with names by removing and adding only the
+        entries that changed, so a refresh neither flickers nor loses the selection.
+        """
+        wanted = list(names)
+        wanted_set = frozenset(wanted)
+        # Nothing else edits these lists, so an unchanged name set means nothing to do
+        if self._synced_names.get(list_widget) == wanted_set:
+            return
+        self._synced_names[list_widget] = wanted_set
+        present = set()
+        list_widget.setUpdatesEnabled(False)
+        try:
+            for row in range(list_widget.count() - 1, -1, -1):
+                name = list_widget.item(row).text()
+                if name in wanted_set and name not in present:
+                    present.add(name)
+                else:
+                    list_widget.takeItem(row)
+            for name in wanted:
+                if name not in present:
+                    list_widget.addItem(name)
+        finally:
+            list_widget.setUpdatesEnabled(True)
     
     def _get_primary_file(self) -> Optional[str]:
         if not self.selected_files:
             return None
         self.preview_index = max(0, min(self.preview_index, len(self.selected_files) - 1))
         file_path = self.selected_files[self.preview_index]
-        for i in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == file_path:
-                self.file_list_widget.setCurrentItem(item, QItemSelectionModel.ClearAndSelect)
-                break
+        # List rows are only appended alongside selected_files (or cleared with it),
+        # so the file's row is its position there
+        item = self.file_list_widget.item(self.preview_index)
+        if item is not None:
+            self.file_list_widget.setCurrentItem(item, QItemSelectionModel.ClearAndSelect)
         return file_path
     
     def _update_image_preview(self):
+        # Results of reads started for an earlier preview are ignored from here on
+        self._tooltip_request += 1
+        self._tooltip_pool.clear()
+        self._tooltip_path = None
         file_path = self._get_primary_file()
         if not file_path:
             self.image_preview_label.setText("No image selected")
             self.image_preview_label.setPixmap(QPixmap())
             return
         
-        pix = QPixmap(file_path)
-        if pix.isNull():
+        pix = self._load_preview_pixmap(file_path, self.image_preview_label.size())
+        if pix is None:
             self.image_preview_label.setText("Preview unavailable")
             self.image_preview_label.setPixmap(QPixmap())
             return
         
-        target_size = self.image_preview_label.size()
-        if pix.width() > target_size.width() or pix.height() > target_size.height():
-            pix = pix.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        
         self.image_preview_label.setPixmap(pix)
         
-        metadata = self.metadata_manager.get_metadata(file_path)
+        # Metadata for the tooltip is only read once the user hovers the preview
+        self.image_preview_label.setToolTip(f"File: {Path(file_path).name}")
+        self._tooltip_path = file_path
+    
+    def eventFilter(self, obj, event):
+        if (obj is self.image_preview_label and event.type() == QEvent.Type.ToolTip
+                and self._tooltip_path is not None):
+            # First hover on this preview: read the metadata off the UI thread; the
+            # file-name tooltip shows meanwhile
+            self._tooltip_pool.start(PreviewTooltipTask(self, self._tooltip_request, self._tooltip_path))
+            self._tooltip_path = None
+        return super().eventFilter(obj, event)
+    
+    @staticmethod
+    def _preview_tooltip(file_path: str, metadata: Dict) -> str:
         tooltip_lines = [f"File: {Path(file_path).name}"]
-        for key in ['Artist', 'Model', 'DateTime', 'ImageDescription']:
-            if key in metadata.get('exif', {}):
-                tooltip_lines.append(f"EXIF {key}: {metadata['exif'][key]}")
-        for key in ['dc:creator', 'dc:description']:
-            if key in metadata.get('xmp', {}):
-                tooltip_lines.append(f"XMP {key}: {metadata['xmp'][key]}")
-        self.image_preview_label.setToolTip("\n".join(tooltip_lines))
+        exif = metadata.get('exif', {})
+        for key in EXIF_TOOLTIP_KEYS:
+            value = exif.get(key)
+            if value is not None:
+                tooltip_lines.append(f"EXIF {key}: {value}")
+        xmp = metadata.get('xmp', {})
+        for key in XMP_TOOLTIP_KEYS:
+            value = xmp.get(key)
+            if value is not None:
+                tooltip_lines.append(f"XMP {key}: {value}")
+        return "\n".join(tooltip_lines)
+    
+    def _on_tooltip_ready(self, request_id: int, tooltip: str):
+        if request_id == self._tooltip_request:
+            self.image_preview_label.setToolTip(tooltip)
+            if self.image_preview_label.underMouse():
+                QToolTip.showText(QCursor.pos(), tooltip, self.image_preview_label)
+    
+    def _load_preview_pixmap(self, file_path: str, target_size: QSize) -> Optional[QPixmap]:
+        """
+        Return file_path scaled down to fit target_size, or None if it cannot be read.
+        Images are decoded straight at the target size where the format supports it
+        (JPEG can skip most of the work), otherwise scaled in two passes, and kept in
+        a small LRU keyed by file identity and target size.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = (file_path, st.st_mtime_ns, st.st_size, target_size.width(), target_size.height())
+        pix = self._pixmap_cache.get(key)
+        if pix is not None:
+            self._pixmap_cache.move_to_end(key)
+            return pix
+        
+        reader = QImageReader(file_path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        # The scaled size applies before the EXIF rotation, so a quarter-turned image is
+        # fitted to the turned-back target
+        read_target = target_size
+        if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+            read_target = target_size.transposed()
+        # Qt emulates setScaledSize for other formats with one smooth pass over the full image
+        scaled_on_read = (size.isValid()
+                          and (size.width() > read_target.width() or size.height() > read_target.height())
+                          and reader.supportsOption(QImageIOHandler.ImageOption.ScaledSize))
+        if scaled_on_read:
+            reader.setScaledSize(size.scaled(read_target, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return None
+        if not scaled_on_read and (image.width() > target_size.width() or image.height() > target_size.height()):
+            image = self._downscale(image, target_size)
+        pix = QPixmap.fromImage(image)
+        
+        self._pixmap_cache[key] = pix
+        if len(self._pixmap_cache) > self.PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+        return pix
+    
+    @staticmethod
+    def _downscale(image: QImage, target_size: QSize) -> QImage:
+        """
+        Fit image into target_size. Large images are first cut to twice the target with
+        a fast pass, so the smooth filter runs over a fraction of the source pixels.
+        """
+        intermediate = QSize(target_size.width() * 2, target_size.height() * 2)
+        if image.width() > intermediate.width() * 2 or image.height() > intermediate.height() * 2:
+            image = image.scaled(intermediate, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation)
+        return image.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    
+    def _drop_cached_previews(self, paths):
+        """Evict previews of rewritten or renamed files; their keys can never hit again."""
+        paths = set(paths)
+        if paths:
+            for key in [k for k in self._pixmap_cache if k[0] in paths]:
+                del self._pixmap_cache[key]
     
     def preview_next(self):
         if self.selected_files:
@@ -1137,31 +1613,27 @@ class PhotoMetadataEditor(QMainWindow):
             self.preview_index = (self.preview_index - 1) % len(self.selected_files)
             self.update_preview()
     
-    def on_file_selected(self):
-        """Called when user clicks on a file in the file list. Updates preview to show that file."""
-        current_item = self.file_list_widget.currentItem()
-        if current_item:
-            selected_path = current_item.data(Qt.ItemDataRole.UserRole)
-            if selected_path and selected_path in self.selected_files:
-                self.preview_index = self.selected_files.index(selected_path)
-                self.update_preview()
-    
     def on_file_selected(self):
         """Called when user clicks on a file in the file list."""
         current_item = self.file_list_widget.currentItem()
         if current_item:
             # Get the selected file and find its index
             selected_path = current_item.data(Qt.ItemDataRole.UserRole)
-            if selected_path in self.selected_files:
-                self.preview_index = self.selected_files.index(selected_path)
+            if selected_path in self._selected_index:
+                self.preview_index = self._selected_index[selected_path]
         self.update_preview()
     
     def update_preview(self):
+        """Schedule a preview redraw; a burst of selection changes is drawn once."""
+        # start() restarts a running timer, so only the last request of a burst renders
+        self._preview_timer.start()
+    
+    def _render_preview(self):
         preview = []
         self._update_image_preview()
         
         if self.selected_template:
-            template = self.template_manager.get_templates().get(self.selected_template, {})
+            template = self.template_manager.get_template(self.selected_template) or {}
             preview.append(f"Template: {self.selected_template}\n")
             preview.append("EXIF:\n")
             for key, value in template.get('exif', {}).items():
@@ -1172,12 +1644,14 @@ class PhotoMetadataEditor(QMainWindow):
         
         file_path = self._get_primary_file()
         if self.selected_naming and file_path:
-            convention = self.template_manager.get_naming_conventions().get(self.selected_naming, {})
+            convention = self.template_manager.get_naming_convention(self.selected_naming) or {}
             pattern = convention.get('pattern', '')
             preview.append(f"\nNaming: {self.selected_naming}\n")
             preview.append(f"Pattern: {pattern}\n")
             
-            metadata = self.metadata_manager.get_metadata(file_path)
+            metadata = None
+            if NamingEngine.uses_metadata(pattern):
+                metadata = self.metadata_manager.get_metadata(file_path, tags=NamingEngine.METADATA_TAGS)
             new_name = self.naming_engine.generate_filename(pattern, file_path, metadata, 1)
             preview.append(f"Result: {new_name}\n")
         
@@ -1187,12 +1661,14 @@ class PhotoMetadataEditor(QMainWindow):
         if not self.selected_files or not self.selected_template or not self.selected_naming:
             QMessageBox.warning(self, "Warning", "Please select files, template, and naming convention.")
             return
+        if self._batch_worker is not None:
+            QMessageBox.information(self, "Info", "A batch is already being processed.")
+            return
         
-        templates = self.template_manager.get_templates()
-        template = self.template_manager._normalize_template_data(dict(templates.get(self.selected_template, {})))
+        template = self.template_manager._normalize_template_data(
+            self.template_manager.get_template(self.selected_template) or {})
         
-        conventions = self.template_manager.get_naming_conventions()
-        convention = conventions.get(self.selected_naming, {})
+        convention = self.template_manager.get_naming_convention(self.selected_naming) or {}
         pattern = convention.get('pattern', '')
         
         merge = self.merge_checkbox.isChecked()
@@ -1202,56 +1678,56 @@ class PhotoMetadataEditor(QMainWindow):
         if QMessageBox.question(self, "Confirm", f"Apply template to {len(self.selected_files)} file(s)? ({action})") != QMessageBox.StandardButton.Yes:
             return
         
-        progress = QProgressDialog("Processing...", None, 0, len(self.selected_files), self)
-        progress.setWindowModality(Qt.WindowModality.WindowModal)
-        
-        success_count = 0
-        rename_map = {}
-        
-        for i, file_path in enumerate(self.selected_files):
-            try:
-                metadata = self.metadata_manager.get_metadata(file_path)
-                new_filename = self.naming_engine.generate_filename(pattern, file_path, metadata, i + 1)
-                new_path = Path(file_path).parent / new_filename
-                
-                if new_path.exists() and str(new_path) != file_path:
-                    base = new_path.stem
-                    ext = new_path.suffix
-                    counter = 1
-                    while new_path.exists():
-                        new_path = Path(file_path).parent / f"{base}_{counter}{ext}"
-                        counter += 1
-                
-                if not dry_run:
-                    exif = self._prepare_metadata_values(template.get('exif', {}), is_xmp=False)
-                    xmp = self._prepare_metadata_values(template.get('xmp', {}), is_xmp=True)
-                    
-                    if self.metadata_manager.set_metadata(file_path, exif, xmp, merge):
-                        if str(new_path) != file_path:
-                            shutil.move(file_path, new_path)
-                            rename_map[file_path] = str(new_path)
-                        success_count += 1
-                        self.log_status(f"✓ {Path(file_path).name} → {new_path.name}")
-                    else:
-                        self.log_status(f"✗ Failed: {Path(file_path).name}")
-                else:
-                    self.log_status(f"[DRY RUN] {Path(file_path).name} → {new_path.name}")
-                    success_count += 1
-            
-            except Exception as e:
-                self.log_status(f"✗ Error: {Path(file_path).name} - {str(e)}")
-                logger.error(f"Error processing {file_path}: {e}\n{traceback.format_exc()}")
-            
-            progress.setValue(i + 1)
-            QApplication.processEvents()
+        files = list(self.selected_files)
+        exif = self._prepare_metadata_values(template.get('exif', {}), is_xmp=False)
+        xmp = self._prepare_metadata_values(template.get('xmp', {}), is_xmp=True)
         
+        # Reading, naming, writing and renaming run on a worker thread, which fans the
+        # reads and writes out to the metadata process pool
+        worker = BatchApplyWorker(self.metadata_manager, self.naming_engine, files,
+                                  pattern, exif, xmp, merge, dry_run, self)
+        worker.log.connect(self.log_status)
+        self._start_batch(worker, "Reading metadata...", len(files), self._on_apply_done)
+    
+    def _on_batch_progress(self, done: int, label: str):
+        if self._batch_progress is not None:
+            self._batch_progress.setLabelText(label)
+            self._batch_progress.setValue(done)
+    
+    def _stop_batch_worker(self):
+        """Cancel a running batch and wait for it, so written files are still renamed before exit."""
+        worker = self._batch_worker
+        if worker is not None and worker.isRunning():
+            worker.cancel()
+            worker.wait()
+    
+    def _end_batch(self) -> QThread:
+        worker, self._batch_worker = self._batch_worker, None
+        progress, self._batch_progress = self._batch_progress, None
+        progress.canceled.disconnect(worker.cancel)
         progress.close()
+        return worker
+    
+    def _on_batch_failed(self, message: str):
+        self._end_batch()
+        QMessageBox.critical(self, "Error", f"Batch processing failed: {message}")
+    
+    def _on_apply_done(self, write_results: Optional[Dict[str, bool]], rename_map: Dict[str, str], success_count: int):
+        worker = self._end_batch()
+        files = worker.files
+        dry_run = worker.dry_run
+        if write_results is None:
+            self.log_status("\nCancelled before any files were processed")
+            return
+        
+        if not dry_run:
+            self._drop_cached_previews(path for path, ok in write_results.items() if ok)
         self._refresh_after_renames(rename_map)
         
         if dry_run:
-            self.log_status(f"\n[DRY RUN] Would process {success_count}/{len(self.selected_files)} files")
+            self.log_status(f"\n[DRY RUN] Would process {success_count}/{len(files)} files")
         else:
-            self.log_status(f"\nComplete: {success_count}/{len(self.selected_files)} successful")
+            self.log_status(f"\nComplete: {success_count}/{len(files)} successful")
     
     def undo_last(self):
         QMessageBox.information(self, "Info", "Undo not yet implemented.")
@@ -1260,22 +1736,40 @@ class PhotoMetadataEditor(QMainWindow):
         if not rename_map:
             return
         
-        self.selected_files = [rename_map.get(path, path) for path in self.selected_files]
-        
-        for i in range(self.file_list_widget.count()):
-            item = self.file_list_widget.item(i)
-            old_path = item.data(Qt.ItemDataRole.UserRole)
-            if old_path in rename_map:
-                new_path = rename_map[old_path]
-                item.setData(Qt.ItemDataRole.UserRole, new_path)
-                item.setText(Path(new_path).name)
+        # Only the renamed rows are touched; each file's row is its selected_files position
+        for old_path, new_path in rename_map.items():
+            row = self._selected_index.get(old_path)
+            if row is None:
+                continue
+            self.selected_files[row] = new_path
+            item = self.file_list_widget.item(row)
+            item.setData(Qt.ItemDataRole.UserRole, new_path)
+            item.setText(Path(new_path).name)
+        self._selected_index = {path: i for i, path in enumerate(self.selected_files)}
         
         self.update_preview()
     
     def log_status(self, message: str):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_text.append(f"[{timestamp}] {message}")
+        self._log_buffer.append(f"[{timestamp}] {message}")
         logger.info(message)
+        # Update checks report from a plain thread; the timer belongs to the UI thread
+        if threading.current_thread() is threading.main_thread():
+            self._schedule_log_flush()
+        else:
+            self._log_pending.emit()
+    
+    def _schedule_log_flush(self):
+        if not self._log_timer.isActive():
+            self._log_timer.start(self.LOG_FLUSH_INTERVAL_MS)
+    
+    def _flush_log(self):
+        """Write buffered status lines with one append, so a burst relayouts the log once."""
+        lines = []
+        while self._log_buffer:
+            lines.append(self._log_buffer.popleft())
+        if lines:
+            self.status_text.append("\n".join(lines))
 
     def _parse_subject_value(self, value: Any) -> Any:
         """Convert pipe- or comma-delimited strings into lists for XMP subject only."""
@@ -1314,7 +1808,7 @@ class PhotoMetadataEditor(QMainWindow):
                     self.update_available = True
                     self.update_btn.setText("✨")
                     self.update_btn.setToolTip(f"Update Available ({latest_version})")
-                    self.update_btn.setStyleSheet("padding: 2px; font-size: 14px; background-color: #ff9800; color: white; border-radius: 4px;")
+                    self.update_btn.setStyleSheet(UPDATE_AVAILABLE_STYLE)
                     self.update_status_label.setText(f"✨ v{latest_version}")
                 elif latest_version:
                     self.update_status_label.setText(f"✓ v{latest_version}")
@@ -1327,10 +1821,18 @@ class PhotoMetadataEditor(QMainWindow):
                 self.update_status_label.setText("⚠️ Error")
         
         try:
-            self.update_checker.check_for_updates_async(callback)
+            self._check_for_updates_async(callback)
         except Exception as e:
             logger.error(f"Failed to start update check: {e}")
     
+    def _check_for_updates_async(self, callback, force: bool = False):
+        """Check for updates in the background and call callback(result) on the UI thread."""
+        self.update_checker.check_for_updates_async(
+            lambda result: self._update_checked.emit(callback, result), force)
+    
+    def _on_update_checked(self, callback, result):
+        callback(result)
+    
     def open_documentation(self):
         """Open GitHub Pages homepage in browser."""
         import webbrowser
@@ -1354,7 +1856,7 @@ class PhotoMetadataEditor(QMainWindow):
                         self.update_available = True
                         self.update_btn.setText("✨")
                         self.update_btn.setToolTip(f"Update Available ({latest_version})")
-                        self.update_btn.setStyleSheet("padding: 2px; font-size: 14px; background-color: #ff9800; color: white; border-radius: 4px;")
+                        self.update_btn.setStyleSheet(UPDATE_AVAILABLE_STYLE)
                         self.log_status(f"✨ Update {latest_version} available! Click the ✨ button to install.")
                         self.update_status_label.setText(f"✨ v{latest_version}")
                     elif latest_version:
@@ -1370,7 +1872,8 @@ class PhotoMetadataEditor(QMainWindow):
                     self.log_status(f"⚠️ Update check error: {e}")
             
             try:
-                self.update_checker.check_for_updates_async(callback)
+                # A user-triggered check always asks GitHub
+                self._check_for_updates_async(callback, force=True)
             except Exception as e:
                 logger.error(f"Failed to start manual update check: {e}")
                 self.update_btn.setEnabled(True)
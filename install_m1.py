@@ -2,7 +2,7 @@
 """
 Install/Update Photo Metadata Editor on Apple Silicon (M1/M2/M3) using PyInstaller.
 - Clones/updates the repo under ~/App/Photo_Metadata_App_By_Gledhill
-- Installs required Python deps (PyInstaller, PySide6, Pillow, piexif)
+- Installs required Python deps (PyInstaller, PySide6, Pillow, piexif, packaging)
 - Builds the app with PyInstaller via setupm1.py
 - Replaces the /Applications/Photo Metadata Editor.app bundle
 - Launches the app
@@ -26,7 +26,7 @@ INSTALL_DIR = Path.home() / "App" / "Photo_Metadata_App_By_Gledhill"
 APP_NAME = "Photo Metadata Editor.app"
 TARGET_APP = Path("/Applications") / APP_NAME
 
-REQ_PACKAGES = ["pip", "PyInstaller", "PySide6", "Pillow", "piexif"]
+REQ_PACKAGES = ["pip", "PyInstaller", "PySide6", "Pillow", "piexif", "packaging"]
 
 
 def run(cmd, cwd=None):
@@ -24,7 +24,11 @@ NOTE: This file is now a simple launcher. All logic is in:
     - gui.py (PhotoMetadataEditor, dialogs, main UI)
 """
 
+import multiprocessing
+
 from gui import main
 
 if __name__ == '__main__':
+    # Batch metadata operations start worker processes; required for frozen (py2app) builds
+    multiprocessing.freeze_support()
     main()
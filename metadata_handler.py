@@ -7,16 +7,30 @@ Robust parsing and normalization of metadata values.
 """
 
 import os
+import sys
+import atexit
+import functools
+import io
 import json
+import mmap
+import zlib
+import marshal
+import sqlite3
 import shutil
 import logging
+import multiprocessing
 import tempfile
+import threading
+import types
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape as xml_escape
 import re
 import binascii
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Set, Iterator
 
 try:
     import piexif
@@ -30,128 +44,605 @@ try:
 except ImportError:
     HAS_PIL = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# JPEG APP1 identifier for XMP packets
+XMP_APP1_NAMESPACE = b'http://ns.adobe.com/xap/1.0/\x00'
+# Clark-notation tags for the RDF elements walked when reading XMP
+RDF_NAMESPACE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#'
+RDF_DESCRIPTION = '{' + RDF_NAMESPACE + '}Description'
+RDF_LI = '{' + RDF_NAMESPACE + '}li'
+# Windows XP* tags, stored as UTF-16LE byte arrays
+XP_UTF16_TAGS = frozenset({'XPTitle', 'XPComment', 'XPAuthor', 'XPKeywords', 'XPSubject'})
+# Separators (with surrounding whitespace) between entries in XP* list tags (XPKeywords etc.)
+XP_SEPARATOR_RE = re.compile(r'\s*[;,\x00]+\s*')
+# Maps characters that would turn a rendered naming token into a path or invalid name to '_'
+FILENAME_SANITIZE_TABLE = str.maketrans(dict.fromkeys('/\\:?', '_'))
+# 8-byte character-code headers that prefix EXIF UserComment values
+USERCOMMENT_PREFIXES = (b'ASCII\x00\x00\x00', b'UNICODE\x00', b'JIS\x00\x00\x00\x00\x00', b'\x00' * 8)
+# Fixed opening/closing lines of packets built by MetadataManager._build_xmp_packet
+XMP_PACKET_HEADER = (
+    '<?xpacket begin="﻿" id="W5M0MpCehiHzreSzNTczkc9d"?>',
+    '<x:xmpmeta xmlns:x="adobe:ns:meta/">',
+    '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">',
+    '<rdf:Description xmlns:dc="http://purl.org/dc/elements/1.1/" '
+    'xmlns:photoshop="http://ns.adobe.com/photoshop/1.0/" '
+    'xmlns:xmp="http://ns.adobe.com/xap/1.0/">',
+)
+XMP_PACKET_FOOTER = ('</rdf:Description>', '</rdf:RDF>', '</x:xmpmeta>', '<?xpacket end="w"?>')
+# Login name for the {userid} naming token; the environment is read once at import
+USERID = os.environ.get('USER') or 'user'
+# Extensions handled by the in-memory JPEG read/write paths
+JPEG_EXTENSIONS = frozenset({'.jpg', '.jpeg'})
+# PNG file signature; EXIF lives in an eXIf chunk
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Bytes probed at the head/tail of a file before falling back to a full XMP scan
+XMP_PROBE_SIZE = 65536
+# Start method for worker processes. The pools are started from a process that already
+# runs other threads (Qt, thread pools), which fork cannot copy safely, so every
+# platform spawns fresh interpreters as Windows and macOS already do
+PROCESS_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+
+@functools.lru_cache(maxsize=4096)
+def _fallback_tag_name(ifd_name: str, tag: int) -> str:
+    """Name for an EXIF tag piexif has no entry for; cached across files."""
+    return f"{ifd_name}:0x{tag:04X}"
+
+
+class MetadataCache:
+    """
+    Persistent store of get_metadata results in ~/.photo_meta_editor/cache/meta.sqlite.
+
+    Rows are keyed by path and only returned while the file's mtime and size
+    still match. Values are zlib-compressed marshal blobs, which keep EXIF
+    tuples and bytes intact where JSON would turn them into lists/strings.
+    """
+
+    # Inserts buffered before a commit
+    COMMIT_EVERY = 100
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.home() / '.photo_meta_editor' / 'cache' / 'meta.sqlite'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS metadata '
+                           '(path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, json BLOB)')
+        self._conn.commit()
+        atexit.register(self.close)
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock:
+                if self._conn is None:
+                    return None
+                row = self._conn.execute('SELECT mtime, size, json FROM metadata WHERE path = ?',
+                                         (path,)).fetchone()
+            if row is None or row[0] != mtime_ns or row[1] != size:
+                return None
+            return marshal.loads(zlib.decompress(row[2]))
+        except Exception as e:
+            logger.debug(f"Metadata cache read error: {e}")
+            return None
+
+    def put(self, path: str, mtime_ns: int, size: int, metadata: Dict[str, Any]):
+        try:
+            blob = zlib.compress(marshal.dumps(metadata))
+            with self._lock:
+                if self._conn is None:
+                    return
+                self._conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?)',
+                                   (path, mtime_ns, size, blob))
+                self._pending += 1
+                if self._pending >= self.COMMIT_EVERY:
+                    self._conn.commit()
+                    self._pending = 0
+        except Exception as e:
+            logger.debug(f"Metadata cache write error: {e}")
+
+    def delete(self, path: str):
+        try:
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.execute('DELETE FROM metadata WHERE path = ?', (path,))
+                    self._pending += 1
+        except Exception as e:
+            logger.debug(f"Metadata cache delete error: {e}")
+
+    def close(self):
+        """Drop rows of files that no longer exist, commit buffered rows and close the database."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                # Files deleted or renamed (e.g. by a batch rename) would otherwise keep their rows forever
+                gone = [(path,) for (path,) in self._conn.execute('SELECT path FROM metadata')
+                        if not os.path.exists(path)]
+                if gone:
+                    self._conn.executemany('DELETE FROM metadata WHERE path = ?', gone)
+                self._conn.commit()
+                self._conn.close()
+            except Exception as e:
+                logger.debug(f"Metadata cache close error: {e}")
+            self._conn = None
+
 
 class MetadataManager:
     """Handles metadata reading/writing using piexif (EXIF) and sidecar XMP."""
     
     SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.tiff', '.tif', '.gif', '.bmp'}
 
-    def __init__(self):
-        self.method = "piexif + embedded XMP"
+    # Comprehensive tag mapping for writes: name -> (IFD, tag id)
+    EXIF_TAG_MAP = {
+        "Artist": ("0th", piexif.ImageIFD.Artist),
+        "Copyright": ("0th", piexif.ImageIFD.Copyright),
+        "ImageDescription": ("0th", piexif.ImageIFD.ImageDescription),
+        "Software": ("0th", piexif.ImageIFD.Software),
+        "DateTime": ("0th", piexif.ImageIFD.DateTime),
+        "DateTimeOriginal": ("Exif", piexif.ExifIFD.DateTimeOriginal),
+        "DateTimeDigitized": ("Exif", piexif.ExifIFD.DateTimeDigitized),
+        "Make": ("0th", piexif.ImageIFD.Make),
+        "Model": ("0th", piexif.ImageIFD.Model),
+        "UserComment": ("Exif", piexif.ExifIFD.UserComment),
+        "XPSubject": ("0th", piexif.ImageIFD.XPSubject),
+        "XPKeywords": ("0th", piexif.ImageIFD.XPKeywords),
+        "XPComment": ("0th", piexif.ImageIFD.XPComment),
+    } if HAS_PIEXIF else {}
+
+    # Backend description; fixed at import along with the HAS_* capability flags
+    method = "piexif + embedded XMP"
+
+    # Entries kept by the in-memory get_metadata cache
+    CACHE_SIZE = 1024
+
+    def __init__(self, use_disk_cache: bool = True):
+        # Long-lived worker pool for the batch APIs, started on first use
+        self._pool = None
+        # LRU of get_metadata results keyed by (path, mtime_ns, size, read options)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Full reads also persist across launches
+        self._disk_cache = None
+        if use_disk_cache:
+            try:
+                self._disk_cache = MetadataCache()
+            except Exception as e:
+                logger.warning(f"Metadata disk cache unavailable: {e}")
+
+    def __getstate__(self):
+        # Worker processes receive a copy of the manager without the pool or caches;
+        # the parent stores whatever they read
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_cache'] = OrderedDict()
+        state['_disk_cache'] = None
+        del state['_cache_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(file_path: str, fields: Optional[Set[str]] = None, tags: Optional[Set[str]] = None,
+                   stop_tag: Optional[str] = None) -> Optional[Tuple]:
+        """Cache key for a read; None when the file cannot be stat'ed."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return (file_path, st.st_mtime_ns, st.st_size,
+                frozenset(fields) if fields is not None else None,
+                frozenset(tags) if tags is not None else None, stop_tag)
+
+    @staticmethod
+    def _copy_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # Callers may edit the returned dicts, so the cache keeps its own copy
+        return {**metadata, 'exif': dict(metadata['exif']), 'xmp': dict(metadata['xmp'])}
+
+    def _cache_get(self, key: Optional[Tuple]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        with self._cache_lock:
+            metadata = self._cache.get(key)
+            if metadata is not None:
+                self._cache.move_to_end(key)
+                return self._copy_metadata(metadata)
+        if key[3:] == (None, None, None):
+            # Only unfiltered reads are persisted
+            if self._disk_cache is not None:
+                metadata = self._disk_cache.get(*key[:3])
+                if metadata is not None:
+                    self._cache_put(key, metadata, persist=False)
+                    return metadata
+        elif key[3] is None and key[5] is None:
+            # A tag-limited read is the full read cut down to those names, so a
+            # cached full read (e.g. from the preview tooltip) answers it too
+            full = self._cache_get(key[:3] + (None, None, None))
+            if full is not None:
+                tags = key[4]
+                return {**full,
+                        'exif': {k: v for k, v in full['exif'].items() if k in tags},
+                        'xmp': {k: v for k, v in full['xmp'].items() if k in tags}}
+        return None
+
+    def _cache_put(self, key: Optional[Tuple], metadata: Dict[str, Any], persist: bool = True):
+        if key is None:
+            return
+        with self._cache_lock:
+            self._cache[key] = self._copy_metadata(metadata)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        if persist and self._disk_cache is not None and key[3:] == (None, None, None):
+            self._disk_cache.put(*key[:3], metadata)
+
+    def _invalidate(self, file_path: str):
+        """Drop every cached read of file_path after it has been rewritten."""
+        with self._cache_lock:
+            for key in [k for k in self._cache if k[0] == file_path]:
+                del self._cache[key]
+        if self._disk_cache is not None:
+            self._disk_cache.delete(file_path)
 
-    def get_metadata(self, file_path: str) -> Dict[str, Any]:
+    def clear_cache(self):
+        """Forget all cached get_metadata results."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _get_pool(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """
+        Return the shared process pool, starting it on first use.
+
+        Keeping the workers alive across batches means interpreter startup and
+        module imports are paid once per session rather than once per batch.
+        max_workers only takes effect when the pool is first started.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                             mp_context=PROCESS_POOL_CONTEXT)
+            atexit.register(self.close)
+        return self._pool
+
+    def close(self):
+        """Shut down the shared worker pool and flush the disk cache."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def get_metadata(self, file_path: str, fields: Optional[Set[str]] = None,
+                     tags: Optional[Set[str]] = None, stop_tag: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract EXIF and XMP metadata from a file.
+
+        Args:
+            file_path: Path to image file
+            fields: Optional subset of {'exif', 'xmp'} to read; None reads both
+            tags: Optional set of EXIF tag names / XMP property names to keep; None keeps all
+            stop_tag: Optional EXIF tag name after which EXIF parsing stops
+
         Returns:
             dict with 'exif' and 'xmp' keys, each containing tag->value mappings
+
+        Results are cached until the file's mtime or size changes.
+        """
+        key = self._cache_key(file_path, fields, tags, stop_tag)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        metadata, ok = self._read_metadata(file_path, fields, tags, stop_tag)
+        if ok:
+            self._cache_put(key, metadata)
+        return metadata
+
+    def _read_metadata(self, file_path: str, fields: Optional[Set[str]] = None,
+                       tags: Optional[Set[str]] = None,
+                       stop_tag: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """
+        Uncached body of get_metadata. Returns (metadata, ok); ok is False when the
+        file could not be read, so the empty fallback is returned but never cached.
         """
-        metadata = {'exif': {}, 'xmp': {}, 'method': 'piexif + embedded XMP'}
+        metadata = {'exif': {}, 'xmp': {}, 'method': self.method}
         try:
-            metadata.update(self._get_metadata_python(file_path))
+            metadata.update(self._get_metadata_python(file_path, fields, tags, stop_tag))
         except Exception as e:
             logger.warning(f"Error reading metadata from {file_path}: {e}")
-        return metadata
+            return metadata, False
+        return metadata, True
+
+    def get_metadata_batch(self, paths: List[str], max_workers: Optional[int] = None,
+                           tags: Optional[Set[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Read metadata for many files across a process pool.
 
+        piexif parsing is CPU-bound, so worker processes scale with cores where
+        threads would serialize on the GIL. Results are keyed by path; tags is
+        passed through to get_metadata.
+        """
+        paths = list(paths)
+        # Serve unchanged files from the cache; only misses go to the workers
+        keys = {p: self._cache_key(p, tags=tags) for p in paths}
+        results = {}
+        misses = []
+        for p in paths:
+            cached = self._cache_get(keys[p])
+            if cached is None:
+                misses.append(p)
+            else:
+                results[p] = cached
+        if len(misses) < 2:
+            for p in misses:
+                results[p] = self.get_metadata(p, tags=tags)
+        else:
+            read = functools.partial(self._read_metadata, tags=tags)
+            # Large chunks amortize the per-task IPC round trip
+            for p, (metadata, ok) in zip(misses, self._get_pool(max_workers).map(read, misses, chunksize=32)):
+                if ok:
+                    self._cache_put(keys[p], metadata)
+                results[p] = metadata
+        return {p: results[p] for p in paths}
 
-    def _get_metadata_python(self, file_path: str) -> Dict[str, Any]:
+    def iter_metadata_batch(self, paths: List[str], tags: Optional[Set[str]] = None,
+                            max_workers: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (path, metadata) pairs as the worker pool finishes them.
+
+        Paths are split into about four chunks per worker and results arrive in
+        completion order, so callers can report progress while the batch runs.
+        """
+        # Cached reads are yielded straight away; only misses go to the workers
+        keys = {}
+        misses = []
+        for path in paths:
+            keys[path] = key = self._cache_key(path, tags=tags)
+            cached = self._cache_get(key)
+            if cached is None:
+                misses.append(path)
+            else:
+                yield path, cached
+        if len(misses) < 2:
+            for path in misses:
+                yield path, self.get_metadata(path, tags=tags)
+            return
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(misses) // (workers * 4))
+        pool = self._get_pool(max_workers)
+        futures = [pool.submit(self._get_metadata_chunk, misses[begin:begin + chunk_size], tags)
+                   for begin in range(0, len(misses), chunk_size)]
+        try:
+            for future in as_completed(futures):
+                for path, metadata, ok in future.result():
+                    if ok:
+                        self._cache_put(keys[path], metadata)
+                    yield path, metadata
+        finally:
+            # Closing the generator early drops the chunks that have not started
+            for future in futures:
+                future.cancel()
+
+    def _get_metadata_chunk(self, paths: List[str], tags: Optional[Set[str]]) -> List[Tuple[str, Dict[str, Any], bool]]:
+        """Worker-side body of iter_metadata_batch; yields _read_metadata's ok flag with each result."""
+        return [(path,) + self._read_metadata(path, tags=tags) for path in paths]
+
+    def get_metadata_threaded(self, paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Read metadata for many files using threads (for I/O-bound, header-only reads)."""
+        paths = list(paths)
+        with ThreadPoolExecutor(max_workers=max_workers or min(32, (os.cpu_count() or 1) + 4)) as executor:
+            return dict(zip(paths, executor.map(self.get_metadata, paths)))
+
+    def set_metadata_batch(self, paths: List[str], exif_data: Dict = None, xmp_data: Dict = None,
+                           merge: bool = False, max_workers: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Apply the same metadata to many files across a process pool.
+
+        Workers open each file themselves, so only paths and the (small)
+        metadata dicts cross the process boundary.
+        """
+        paths = list(paths)
+        if len(paths) < 2:
+            return {p: self.set_metadata(p, exif_data, xmp_data, merge) for p in paths}
+        n = len(paths)
+        results = dict(zip(paths, self._get_pool(max_workers).map(
+            self.set_metadata, paths, [exif_data] * n, [xmp_data] * n, [merge] * n, chunksize=32)))
+        # The workers rewrote these files, so this process's cached reads are stale
+        for p, ok in results.items():
+            if ok:
+                self._invalidate(p)
+        return results
+
+    def iter_set_metadata_batch(self, paths: List[str], exif_data: Dict = None, xmp_data: Dict = None,
+                                merge: bool = False,
+                                max_workers: Optional[int] = None) -> Iterator[Tuple[str, bool]]:
+        """
+        Like set_metadata_batch, but yield (path, success) pairs as chunks finish.
+
+        Closing the generator early cancels the chunks that have not started.
+        """
+        return self._iter_write_batch(self._set_metadata_chunk, list(paths),
+                                      (exif_data, xmp_data, merge), max_workers)
+
+    def iter_delete_metadata_batch(self, paths: List[str],
+                                   max_workers: Optional[int] = None) -> Iterator[Tuple[str, bool]]:
+        """Strip metadata from many files, yielding (path, success) as pool chunks finish."""
+        return self._iter_write_batch(self._delete_metadata_chunk, list(paths), (), max_workers)
+
+    def _iter_write_batch(self, chunk_func, paths: List[str], args: Tuple,
+                          max_workers: Optional[int]) -> Iterator[Tuple[str, bool]]:
+        """
+        Run chunk_func(chunk, *args) over paths in the process pool and yield its
+        (path, success) pairs. Closing the generator early cancels unstarted chunks.
+        """
+        if len(paths) < 2:
+            # In-process calls invalidate their own cache entries
+            yield from chunk_func(paths, *args)
+            return
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(paths) // (workers * 4))
+        pool = self._get_pool(max_workers)
+        futures = [pool.submit(chunk_func, paths[begin:begin + chunk_size], *args)
+                   for begin in range(0, len(paths), chunk_size)]
+        try:
+            for future in as_completed(futures):
+                for path, ok in future.result():
+                    # The worker rewrote this file, so this process's cached reads are stale
+                    if ok:
+                        self._invalidate(path)
+                    yield path, ok
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _set_metadata_chunk(self, paths: List[str], exif_data: Optional[Dict], xmp_data: Optional[Dict],
+                            merge: bool) -> List[Tuple[str, bool]]:
+        """Worker-side body of iter_set_metadata_batch."""
+        return [(path, self.set_metadata(path, exif_data, xmp_data, merge)) for path in paths]
+
+    def _delete_metadata_chunk(self, paths: List[str]) -> List[Tuple[str, bool]]:
+        """Worker-side body of iter_delete_metadata_batch."""
+        return [(path, self.delete_metadata(path)) for path in paths]
+
+    def _get_metadata_python(self, file_path: str, fields: Optional[Set[str]] = None,
+                             tags: Optional[Set[str]] = None, stop_tag: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract metadata using piexif (EXIF) and XMP (sidecar and embedded).
         Robust handling of all tag types and encodings.
+        Only the domains listed in fields are read (both when None); tags limits
+        which entries are decoded and stop_tag ends the EXIF walk once it is read.
         """
         exif_data = {}
         xmp_data = {}
 
         # EXIF via piexif - robust parsing
-        if HAS_PIEXIF:
+        if HAS_PIEXIF and (fields is None or 'exif' in fields):
             try:
-                img_data = piexif.load(file_path)
+                img_data = self._load_exif(file_path)
+                stopped = False
                 for ifd_name, ifd in img_data.items():
+                    if stopped:
+                        break
                     if not isinstance(ifd, dict) or ifd_name == 'thumbnail':
                         continue
+                    ifd_name = sys.intern(ifd_name)
+                    # Resolve the IFD's tag table once rather than per tag
+                    tag_info_get = (piexif.TAGS.get(ifd_name) or {}).get
                     for tag, tag_value in ifd.items():
-                        try:
-                            tag_info = piexif.TAGS.get(ifd_name, {}).get(tag)
-                            tag_name = tag_info.get('name') if tag_info else None
-                        except Exception:
-                            tag_name = None
+                        if stopped:
+                            break
+                        tag_info = tag_info_get(tag)
+                        tag_name = tag_info.get('name') if tag_info else None
                         if not tag_name:
-                            tag_name = f"{ifd_name}:0x{tag:04X}"
+                            tag_name = _fallback_tag_name(ifd_name, tag)
+                        if tags is not None and tag_name not in tags:
+                            # Unrequested tags are never decoded
+                            continue
+                        if tag_name == stop_tag:
+                            stopped = True
+                        value_type = type(tag_value)
+                        if value_type is int:
+                            # Plain SHORT/LONG values (the bulk of EXIF) need no decoding
+                            exif_data[tag_name] = tag_value
+                            continue
+                        if value_type is tuple and tag_name not in XP_UTF16_TAGS:
+                            # RATIONAL pairs, GPS rational sequences and SHORT arrays are kept
+                            # as-is; an exact type check skips the isinstance/try path below
+                            exif_data[tag_name] = tag_value
+                            continue
                         try:
-                            if tag_name.startswith('XP') or tag_name.lower() in ('xpkeywords', 'xpsubject', 'xptitle', 'xpcomments'):
-                                if isinstance(tag_value, (list, tuple)):
-                                    try:
-                                        tag_value = bytes(tag_value)
-                                    except Exception:
-                                        tag_value = str(tag_value)
+                            if tag_name in XP_UTF16_TAGS:
+                                if value_type is tuple or value_type is list:
+                                    # piexif yields BYTE arrays as int tuples; convert once to raw bytes
+                                    tag_value = bytes(tag_value)
                                 if isinstance(tag_value, (bytes, bytearray)):
-                                    try:
-                                        val = tag_value.decode('utf-16le', errors='ignore').rstrip('\x00')
-                                    except Exception:
-                                        val = tag_value.decode('utf-8', errors='replace') if isinstance(tag_value, (bytes, bytearray)) else str(tag_value)
-                                    parts = [p.strip() for p in re.split(r'[;,\x00]+', val) if p.strip()]
+                                    # Trailing NULs are dropped by the split below
+                                    val = tag_value.decode('utf-16le', errors='ignore')
+                                    parts = [p for p in XP_SEPARATOR_RE.split(val.strip()) if p]
                                     tag_value = parts if len(parts) > 1 else (parts[0] if parts else '')
                             elif isinstance(tag_value, (bytes, bytearray)):
-                                val = tag_value.decode('utf-8', errors='replace')
-                                if tag_name == 'UserComment' and val:
-                                    val = re.sub(r'^(ASCII|UNICODE|JIS)\s*\x00+', '', val, flags=re.IGNORECASE)
-                                    val = val.rstrip('\x00').strip()
-                                tag_value = val
+                                if tag_name == 'UserComment':
+                                    # Skip the character-code header and drop NULs on the raw bytes
+                                    if tag_value[:8] in USERCOMMENT_PREFIXES:
+                                        tag_value = tag_value[8:]
+                                    tag_value = tag_value.translate(None, b'\x00').decode('utf-8', errors='replace').strip()
+                                elif tag_value.isascii():
+                                    # ASCII-typed tags dominate; skip the error-handler path
+                                    tag_value = tag_value.decode()
+                                else:
+                                    tag_value = tag_value.decode('utf-8', errors='replace')
                         except Exception:
                             pass
                         exif_data[tag_name] = tag_value
-                exif_data = self._normalize_metadata_dict(exif_data)
+            except OSError:
+                # The file could not be read at all; let get_metadata see the failure
+                raise
             except Exception as e:
                 logger.debug(f"piexif read error: {e}")
 
         # Only embedded XMP
-        try:
-            xmp_data.update(self._read_embedded_xmp(file_path))
-        except Exception as e:
-            logger.debug(f"embedded XMP read error: {e}")
+        if fields is None or 'xmp' in fields:
+            try:
+                xmp_data.update(self._read_embedded_xmp(file_path, tags))
+            except OSError:
+                raise
+            except Exception as e:
+                logger.debug(f"embedded XMP read error: {e}")
 
         return {'exif': exif_data, 'xmp': xmp_data}
 
-    def _read_embedded_xmp(self, file_path: str) -> Dict[str, Any]:
+    def _load_exif(self, file_path: str) -> Dict[str, Any]:
+        """
+        Load EXIF with piexif, reading only the bytes that hold it.
+        piexif already stops at the EXIF APP1 segment for JPEG paths; PNGs are
+        handled here by seeking between chunk headers to the eXIf chunk.
+        """
+        with open(file_path, 'rb') as f:
+            if f.read(8) == PNG_SIGNATURE:
+                while True:
+                    header = f.read(8)
+                    if len(header) < 8 or header[4:8] == b'IEND':
+                        return {}
+                    length = int.from_bytes(header[:4], 'big')
+                    if header[4:8] == b'eXIf':
+                        return piexif.load(f.read(length))
+                    f.seek(length + 4, os.SEEK_CUR)  # chunk data + CRC
+        return piexif.load(file_path)
+
+    def _read_embedded_xmp(self, file_path: str, tags: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         Extract XMP metadata embedded in JPEG/TIFF files (search for XMP packet in file bytes).
-        Returns a dict of XMP fields.
+        Returns a dict of XMP fields, limited to the names in tags when given.
         """
         xmp_dict = {}
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            # XMP packets are between <x:xmpmeta ...> and </x:xmpmeta>
-            start = data.find(b'<x:xmpmeta')
-            end = data.find(b'</x:xmpmeta>')
-            if start != -1 and end != -1:
-                xmp_bytes = data[start:end+12]  # 12 = len('</x:xmpmeta>')
-                try:
-                    xmp_str = xmp_bytes.decode('utf-8', errors='replace')
-                except Exception:
-                    xmp_str = xmp_bytes.decode('latin-1', errors='replace')
+            xmp_bytes = self._read_xmp_packet_bytes(file_path)
+            if xmp_bytes:
+                # errors='replace' cannot raise, so no fallback encoding is needed
+                xmp_str = xmp_bytes.decode('utf-8', errors='replace')
                 # Parse XML
                 root = ET.fromstring(xmp_str)
-                # Register common namespaces
-                namespaces = {
-                    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
-                    'dc': 'http://purl.org/dc/elements/1.1/',
-                    'photoshop': 'http://ns.adobe.com/photoshop/1.0/',
-                    'xmp': 'http://ns.adobe.com/xap/1.0/',
-                }
-                for prefix, uri in namespaces.items():
-                    ET.register_namespace(prefix, uri)
-                # Find all Description elements
-                descriptions = root.findall('.//{http://www.w3.org/1999/02/22-rdf-syntax-ns#}Description')
-                for desc in descriptions:
+                # Element.iter runs in the C accelerator, unlike findall's path matching
+                for desc in root.iter(RDF_DESCRIPTION):
                     for attr_name, attr_value in desc.attrib.items():
-                        local_name = attr_name.split('}')[-1] if '}' in attr_name else attr_name
-                        xmp_dict[local_name] = attr_value
+                        # rpartition yields the whole name when there is no namespace
+                        local_name = attr_name.rpartition('}')[2]
+                        if tags is None or local_name in tags:
+                            xmp_dict[local_name] = attr_value
                     for child in desc:
-                        tag = child.tag
-                        local_name = tag.split('}')[-1] if '}' in tag else tag
-                        li_nodes = child.findall('.//{http://www.w3.org/1999/02/22-rdf-syntax-ns#}li')
+                        local_name = child.tag.rpartition('}')[2]
+                        if tags is not None and local_name not in tags:
+                            continue
+                        li_nodes = list(child.iter(RDF_LI))
                         if li_nodes:
                             li_texts = [(li.text or '').strip() for li in li_nodes if (li.text or '').strip()]
                             xmp_dict[local_name] = li_texts if len(li_texts) > 1 else (li_texts[0] if li_texts else '')
@@ -159,9 +650,66 @@ class MetadataManager:
                             text = (child.text or '').strip()
                             if text:
                                 xmp_dict[local_name] = text
+        except OSError:
+            raise
         except Exception as e:
             logger.debug(f"Error reading embedded XMP: {e}")
         return xmp_dict
+
+    @staticmethod
+    def _find_xmp_packet(data) -> Optional[bytes]:
+        """Return the <x:xmpmeta>...</x:xmpmeta> slice of data, if complete."""
+        start = data.find(b'<x:xmpmeta')
+        if start == -1:
+            return None
+        end = data.find(b'</x:xmpmeta>', start)
+        if end == -1:
+            return None
+        return data[start:end+12]  # 12 = len('</x:xmpmeta>')
+
+    def _read_xmp_packet_bytes(self, file_path: str) -> Optional[bytes]:
+        """
+        Locate the raw XMP packet in a file without reading all of it when possible.
+        Probes the file head first; JPEGs then only walk their header segments
+        (XMP must live in an APP1 segment before the image data), other formats
+        probe the tail before falling back to a full scan.
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(XMP_PROBE_SIZE)
+            packet = self._find_xmp_packet(head)
+            if packet:
+                return packet
+
+            if head[:2] == b'\xff\xd8':
+                f.seek(2)
+                while True:
+                    header = f.read(4)
+                    if len(header) < 4 or header[0] != 0xFF or header[1] == 0xDA:
+                        return None
+                    if 0xD0 <= header[1] <= 0xD7 or header[1] == 0x01:
+                        # Standalone marker without a length field
+                        f.seek(-2, os.SEEK_CUR)
+                        continue
+                    length = (header[2] << 8) | header[3]
+                    if length < 2:
+                        return None
+                    if header[1] == 0xE1:
+                        segment = f.read(length - 2)
+                        if segment.startswith(XMP_APP1_NAMESPACE):
+                            return self._find_xmp_packet(segment)
+                    else:
+                        f.seek(length - 2, os.SEEK_CUR)
+
+            size = os.fstat(f.fileno()).st_size
+            if size <= XMP_PROBE_SIZE:
+                return None
+            f.seek(max(XMP_PROBE_SIZE, size - XMP_PROBE_SIZE))
+            packet = self._find_xmp_packet(f.read())
+            if packet:
+                return packet
+            # Map the file instead of reading it so memory stays bounded on large files
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return self._find_xmp_packet(mm)
     
     def set_metadata(self, file_path: str, exif_data: Dict = None, xmp_data: Dict = None,
                      merge: bool = False) -> bool:
@@ -175,21 +723,25 @@ class MetadataManager:
             merge: If True, merge with existing; if False, overwrite
         
         Returns:
-            True if successful, False otherwise
+            True if successful (including when the file already held these values), False otherwise
         """
         if not exif_data and not xmp_data:
             return True
         
-        # Use temp file for atomic writes
-        temp_fd, temp_path = tempfile.mkstemp(suffix=Path(file_path).suffix)
+        # Write to a temp file beside the original so os.replace is an atomic rename
+        temp_path = self._make_temp_path(file_path)
         try:
-            os.close(temp_fd)
-            shutil.copy2(file_path, temp_path)
-            
-            success = self._set_metadata_python(temp_path, exif_data, xmp_data, merge)
+            success = self._set_metadata_python(temp_path, exif_data, xmp_data, merge,
+                                                source_path=file_path)
             
+            if success is None:
+                # The rewrite would be byte-identical (e.g. re-applying a template), so
+                # the original, its mtime and its cached reads are left untouched
+                os.unlink(temp_path)
+                return True
             if success:
-                shutil.move(temp_path, file_path)
+                os.replace(temp_path, file_path)
+                self._invalidate(file_path)
                 return True
             else:
                 os.unlink(temp_path)
@@ -197,72 +749,76 @@ class MetadataManager:
         except Exception as e:
             logger.error(f"Error writing metadata: {e}")
 
-            if os.path.exists(temp_path):
+            try:
                 os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
             return False
+
+    def _make_temp_path(self, file_path: str) -> str:
+        """Create an empty temp file in file_path's directory with the same permissions."""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=os.path.splitext(file_path)[1],
+                                              dir=os.path.dirname(os.path.abspath(file_path)))
+        os.close(temp_fd)
+        try:
+            shutil.copymode(file_path, temp_path)
+        except OSError:
+            pass
+        return temp_path
     
     def _set_metadata_python(self, file_path: str, exif_data: Dict = None,
-                             xmp_data: Dict = None, merge: bool = False) -> bool:
+                             xmp_data: Dict = None, merge: bool = False,
+                             source_path: Optional[str] = None) -> Optional[bool]:
         """
         Write metadata using piexif and sidecar XMP.
         Robust encoding handling and tag mapping.
+        The image is read from source_path (default: file_path) and written to file_path.
+        Returns None, without writing file_path, when source_path differs and the
+        result would be identical to it.
         """
         try:
+            source_path = source_path or file_path
+            # JPEGs are read once and spliced in memory, then written once
+            jpeg_data = None
+            # Other formats copied from source_path are edited in memory too, so the
+            # destination is written once instead of copied and then rewritten
+            image_data = None
+            if self._is_jpeg(file_path):
+                with open(source_path, 'rb') as f:
+                    jpeg_data = f.read()
+            elif source_path != file_path:
+                with open(source_path, 'rb') as f:
+                    image_data = f.read()
+            original_jpeg_data = jpeg_data if source_path == file_path else None
+            source_data = jpeg_data if jpeg_data is not None else image_data
+
             # Write EXIF using piexif
             if HAS_PIEXIF and exif_data:
                 try:
-                    # Load existing or create new
-                    exif_dict = piexif.load(file_path) if merge else {
-                        "0th": {}, "Exif": {}, "GPS": {}, "1st": {}, "thumbnail": None
-                    }
-
-                    # Comprehensive tag mapping
-                    tag_map = {
-                        "Artist": ("0th", piexif.ImageIFD.Artist),
-                        "Copyright": ("0th", piexif.ImageIFD.Copyright),
-                        "ImageDescription": ("0th", piexif.ImageIFD.ImageDescription),
-                        "Software": ("0th", piexif.ImageIFD.Software),
-                        "DateTime": ("0th", piexif.ImageIFD.DateTime),
-                        "DateTimeOriginal": ("Exif", piexif.ExifIFD.DateTimeOriginal),
-                        "DateTimeDigitized": ("Exif", piexif.ExifIFD.DateTimeDigitized),
-                        "Make": ("0th", piexif.ImageIFD.Make),
-                        "Model": ("0th", piexif.ImageIFD.Model),
-                        "UserComment": ("Exif", piexif.ExifIFD.UserComment),
-                        "XPSubject": ("0th", piexif.ImageIFD.XPSubject),
-                        "XPKeywords": ("0th", piexif.ImageIFD.XPKeywords),
-                        "XPComment": ("0th", piexif.ImageIFD.XPComment),
-                    }
-
-                    for key, value in exif_data.items():
-                        if key in tag_map:
-                            ifd_name, tag_id = tag_map[key]
-                            
-                            # Encode value appropriately
-                            if isinstance(value, str):
-                                # XP* tags use UTF-16LE
-                                if key.startswith('XP'):
-                                    try:
-                                        value_bytes = value.encode('utf-16le')
-                                    except Exception:
-                                        value_bytes = value.encode('utf-8', errors='ignore')
-                                else:
-                                    value_bytes = value.encode('utf-8', errors='ignore')
-                            else:
-                                value_bytes = value
-                            
-                            # Clean up UserComment prefix
-                            if key == "UserComment" and isinstance(value_bytes, bytes):
-                                prefix = b"ASCII\x00\x00\x00"
-                                if value_bytes.startswith(prefix):
-                                    value_bytes = value_bytes[len(prefix):]
-                                # Only add prefix if not already there
-                                if not value_bytes.startswith(prefix):
-                                    value_bytes = prefix + value_bytes
-                            
-                            exif_dict[ifd_name][tag_id] = value_bytes
-
-                    piexif.insert(piexif.dump(exif_dict), file_path)
-                    logger.info(f"Wrote EXIF metadata to {Path(file_path).name}")
+                    # Only the supplied tags are encoded; without merge they make up the
+                    # whole dict, so nothing is loaded from the source image
+                    exif_dict = {"0th": {}, "Exif": {}, "GPS": {}, "1st": {}, "thumbnail": None}
+                    if merge:
+                        if jpeg_data is not None:
+                            # Parse just the EXIF segment rather than letting piexif
+                            # split the whole JPEG, scan data included, into segments
+                            start, end = self._jpeg_exif_span(jpeg_data)
+                            if end > start:
+                                exif_dict = piexif.load(jpeg_data[start + 4:end])
+                        else:
+                            exif_dict = piexif.load(image_data if image_data is not None else file_path)
+
+                    for ifd_name, tags in self._encode_exif_values(exif_data).items():
+                        exif_dict[ifd_name].update(tags)
+
+                    exif_bytes = piexif.dump(exif_dict)
+                    if jpeg_data is not None:
+                        jpeg_data = self._splice_exif_into_jpeg(jpeg_data, exif_bytes)
+                    elif image_data is not None:
+                        image_data = self._insert_exif_into_data(image_data, exif_bytes)
+                    else:
+                        piexif.insert(exif_bytes, file_path)
+                    logger.info(f"Wrote EXIF metadata to {os.path.basename(file_path)}")
                 except Exception as e:
                     logger.warning(f"piexif write error: {e}")
             
@@ -270,121 +826,146 @@ class MetadataManager:
             if xmp_data is not None:
                 try:
                     xmp_packet = self._build_xmp_packet(xmp_data)
-                    if self._is_jpeg(file_path):
-                        self._inject_xmp_into_jpeg(file_path, xmp_packet.encode('utf-8'))
-                        logger.info(f"Embedded XMP in JPEG: {Path(file_path).name}")
+                    if jpeg_data is not None:
+                        jpeg_data = self._inject_xmp_into_jpeg_data(jpeg_data, xmp_packet.encode('utf-8'))
+                        logger.info(f"Embedded XMP in JPEG: {os.path.basename(file_path)}")
                     # TODO: Add TIFF embedding if needed
                 except Exception as e:
                     logger.warning(f"Embedded XMP write error: {e}")
+
+            output = jpeg_data if jpeg_data is not None else image_data
+            if source_data is not None and source_path != file_path and output == source_data:
+                return None
+            if jpeg_data is not None and jpeg_data is not original_jpeg_data:
+                with open(file_path, 'wb') as f:
+                    f.write(jpeg_data)
+            elif image_data is not None:
+                with open(file_path, 'wb') as f:
+                    f.write(image_data)
             return True
         except Exception as e:
             logger.error(f"Metadata write error: {e}")
             return False
     
+    def _encode_exif_values(self, exif_data: Dict) -> Dict[str, Dict[int, Any]]:
+        """Encode tag-name keyed EXIF values for piexif, grouped as {ifd_name: {tag_id: value}}."""
+        encoded = {}
+        for key, value in exif_data.items():
+            if key not in self.EXIF_TAG_MAP:
+                continue
+            ifd_name, tag_id = self.EXIF_TAG_MAP[key]
+
+            # Encode value appropriately
+            if isinstance(value, str):
+                # XP* tags use UTF-16LE
+                if key in XP_UTF16_TAGS:
+                    try:
+                        value_bytes = value.encode('utf-16le')
+                    except Exception:
+                        value_bytes = value.encode('utf-8', errors='ignore')
+                else:
+                    value_bytes = value.encode('utf-8', errors='ignore')
+            else:
+                value_bytes = value
+
+            # Clean up UserComment prefix
+            if key == "UserComment" and isinstance(value_bytes, bytes):
+                prefix = b"ASCII\x00\x00\x00"
+                if value_bytes.startswith(prefix):
+                    value_bytes = value_bytes[len(prefix):]
+                # Only add prefix if not already there
+                if not value_bytes.startswith(prefix):
+                    value_bytes = prefix + value_bytes
+
+            encoded.setdefault(ifd_name, {})[tag_id] = value_bytes
+        return encoded
+
     def delete_metadata(self, file_path: str) -> bool:
         """Remove all EXIF and XMP metadata from a file."""
-        temp_fd, temp_path = tempfile.mkstemp(suffix=Path(file_path).suffix)
+        temp_path = self._make_temp_path(file_path)
         try:
-            os.close(temp_fd)
-            shutil.copy2(file_path, temp_path)
+            # The image is stripped in memory and the temp file written once, only
+            # on success; nothing is copied for formats piexif cannot edit
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            is_jpeg = self._is_jpeg(file_path)
             
             success = False
             if HAS_PIEXIF:
                 try:
-                    piexif.insert(piexif.dump({
+                    empty_exif = piexif.dump({
                         "0th": {}, "Exif": {}, "GPS": {}, "1st": {}, "thumbnail": None
-                    }), temp_path)
+                    })
+                    if is_jpeg:
+                        data = self._splice_exif_into_jpeg(data, empty_exif)
+                    else:
+                        data = self._insert_exif_into_data(data, empty_exif)
                     success = True
-                    logger.info(f"Deleted EXIF metadata from {Path(file_path).name}")
+                    logger.info(f"Deleted EXIF metadata from {os.path.basename(file_path)}")
                 except Exception as e:
                     logger.warning(f"piexif delete error: {e}")
             
             # Delete embedded XMP from JPEG files
-            if self._is_jpeg(temp_path):
+            if is_jpeg:
                 try:
-                    self._remove_xmp_from_jpeg(temp_path)
-                    logger.info(f"Deleted XMP metadata from {Path(file_path).name}")
+                    data = self._remove_xmp_from_jpeg_data(data)
+                    logger.info(f"Deleted XMP metadata from {os.path.basename(file_path)}")
                 except Exception as e:
                     logger.warning(f"XMP deletion error: {e}")
             
             if success:
-                shutil.move(temp_path, file_path)
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, file_path)
+                self._invalidate(file_path)
                 return True
             else:
                 os.unlink(temp_path)
                 return False
         except Exception as e:
             logger.error(f"Error deleting metadata: {e}")
-            if os.path.exists(temp_path):
+            try:
                 os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
             return False
 
+    @staticmethod
+    def _insert_exif_into_data(data: bytes, exif_bytes: bytes) -> bytes:
+        """piexif.insert on in-memory non-JPEG image data (JPEGs use _splice_exif_into_jpeg)."""
+        if data[:4] != b'RIFF' or data[8:12] != b'WEBP':
+            raise ValueError("EXIF can only be embedded in JPEG and WebP files")
+        output = io.BytesIO()
+        piexif.insert(exif_bytes, data, output)
+        return output.getvalue()
+
     def _is_jpeg(self, file_path: str) -> bool:
         """Check if file is a JPEG."""
-        ext = Path(file_path).suffix.lower()
-        return ext in {'.jpg', '.jpeg'}
+        # os.path.splitext avoids building a Path on this per-file hot path
+        return os.path.splitext(file_path)[1].lower() in JPEG_EXTENSIONS
     
-    def _remove_xmp_from_jpeg(self, file_path: str) -> None:
-        """Remove embedded XMP metadata from a JPEG file."""
-        with open(file_path, 'rb') as f:
-            data = f.read()
-        
-        # Parse JPEG markers and rebuild without XMP APP1
-        new_data = b''
-        i = 0
-        while i < len(data):
-            if data[i:i+2] == b'\xff\xd8':  # SOI
-                new_data += data[i:i+2]
-                i += 2
-            elif data[i:i+2] == b'\xff\xd9':  # EOI
-                new_data += data[i:i+2]
-                i += 2
-            elif data[i] == 0xff and i + 1 < len(data):
-                marker = data[i+1]
-                # APP1 marker
-                if marker == 0xe1 and i + 3 < len(data):
-                    length = (data[i+2] << 8) | data[i+3]
-                    segment_data = data[i+4:i+2+length]
-                    # Check if it's XMP (starts with "http://ns.adobe.com/xap/1.0/\x00")
-                    if segment_data.startswith(b'http://ns.adobe.com/xap/1.0/\x00'):
-                        # Skip XMP APP1 marker
-                        i += 2 + length
-                    else:
-                        # Keep EXIF APP1 marker
-                        new_data += data[i:i+2+length]
-                        i += 2 + length
-                elif marker in [0xd0, 0xd1, 0xd2, 0xd3, 0xd4, 0xd5, 0xd6, 0xd7, 0xd8, 0xd9]:  # RSTn, EOI
-                    new_data += data[i:i+2]
-                    i += 2
-                else:
-                    # Other markers with length field
-                    if i + 3 < len(data):
-                        length = (data[i+2] << 8) | data[i+3]
-                        new_data += data[i:i+2+length]
-                        i += 2 + length
-                    else:
-                        new_data += data[i:i+2]
-                        i += 2
-            else:
-                new_data += data[i:i+1]
-                i += 1
-        
-        with open(file_path, 'wb') as f:
-            f.write(new_data)
+    def _remove_xmp_from_jpeg_data(self, data: bytes) -> bytes:
+        """Remove embedded XMP APP1 segments from in-memory JPEG data."""
+        if data[0:2] != b'\xff\xd8':
+            raise ValueError("Not a valid JPEG file")
+
+        output = bytearray(data[0:2])
+        pos = 2
+        # XMP only lives in APP1 segments ahead of SOS; the scan data is copied as-is
+        while pos + 4 <= len(data) and data[pos] == 0xFF and data[pos+1] != 0xDA:
+            length = (data[pos+2] << 8) | data[pos+3]
+            end = pos + 2 + length
+            if not (data[pos+1] == 0xE1 and data[pos+4:end].startswith(XMP_APP1_NAMESPACE)):
+                output += data[pos:end]
+            pos = end
+        output += data[pos:]
+        return bytes(output)
 
     def _build_xmp_packet(self, xmp_data: Dict[str, Any]) -> str:
         """Build a minimal XMP packet from a dict of fields."""
-        import xml.sax.saxutils as sax
-        def _escape(s): return sax.escape(str(s))
+        def _escape(s): return xml_escape(str(s))
         
-        lines = [
-            '<?xpacket begin="﻿" id="W5M0MpCehiHzreSzNTczkc9d"?>',
-            '<x:xmpmeta xmlns:x="adobe:ns:meta/">',
-            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">',
-            '<rdf:Description xmlns:dc="http://purl.org/dc/elements/1.1/" '
-            'xmlns:photoshop="http://ns.adobe.com/photoshop/1.0/" '
-            'xmlns:xmp="http://ns.adobe.com/xap/1.0/">'
-        ]
+        lines = list(XMP_PACKET_HEADER)
         
         # Dublin Core fields
         if 'title' in xmp_data:
@@ -416,220 +997,137 @@ class MetadataManager:
         if 'CreateDate' in xmp_data:
             lines.append(f'<xmp:CreateDate>{_escape(xmp_data["CreateDate"])}</xmp:CreateDate>')
         
-        lines.append('</rdf:Description>')
-        lines.append('</rdf:RDF>')
-        lines.append('</x:xmpmeta>')
-        lines.append('<?xpacket end="w"?>')
+        lines.extend(XMP_PACKET_FOOTER)
         
         return '\n'.join(lines)
 
-    def _inject_xmp_into_jpeg(self, file_path: str, xmp_packet: bytes):
-        """Inject XMP packet into JPEG file as APP1 marker."""
+    def _splice_exif_into_jpeg(self, data: bytes, exif_bytes: bytes) -> bytes:
+        """Replace (or insert) the EXIF APP1 segment in in-memory JPEG data."""
+        if data[0:2] != b'\xff\xd8':
+            raise ValueError("Not a valid JPEG file")
+        if len(exif_bytes) + 2 > 0xFFFF:
+            raise ValueError("EXIF data too large for APP1 segment")
+
+        segment = b'\xff\xe1' + (len(exif_bytes) + 2).to_bytes(2, 'big') + exif_bytes
+        start, end = self._jpeg_exif_span(data)
+        return data[:start] + segment + data[end:]
+
+    @staticmethod
+    def _jpeg_exif_span(data: bytes) -> Tuple[int, int]:
+        """
+        Locate the EXIF APP1 segment (marker included) in JPEG data.
+        Returns (start, end); start == end is the insertion point when there is none.
+        """
+        insert_at = 2
+        pos = 2
+        # Walk header segments up to SOS (start of scan)
+        while pos + 4 <= len(data) and data[pos] == 0xFF and data[pos+1] != 0xDA:
+            marker = data[pos+1]
+            length = (data[pos+2] << 8) | data[pos+3]
+            end = pos + 2 + length
+            if marker == 0xE1 and data[pos+4:pos+10] == b'Exif\x00\x00':
+                return pos, end
+            if marker == 0xE0 and pos == insert_at:
+                # Keep a leading JFIF APP0 segment first
+                insert_at = end
+            pos = end
+        return insert_at, insert_at
+
+    def _inject_xmp_into_jpeg_data(self, data: bytes, xmp_packet: bytes) -> bytes:
+        """
+        Inject XMP packet into in-memory JPEG data as an APP1 segment, replacing any existing one.
+        The segment goes right after the EXIF APP1 (or after a leading JFIF APP0 when there is
+        no EXIF), so readers that expect EXIF first still find it there.
+        """
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            # JPEG structure: FFD8 (SOI) followed by markers
             # APP1 marker for XMP: FFE1 [length] "http://ns.adobe.com/xap/1.0/\x00" [XMP packet]
-            XMP_NAMESPACE = b'http://ns.adobe.com/xap/1.0/\x00'
-            
-            # Remove existing XMP if present
-            output = bytearray()
-            pos = 0
-            
-            if data[0:2] != b'\xff\xd8':
-                raise ValueError("Not a valid JPEG file")
-            
-            output.extend(data[0:2])  # SOI marker
-            pos = 2
-            
-            xmp_injected = False
-            
-            while pos < len(data) - 1:
-                if data[pos] != 0xFF:
-                    # No more markers, rest is image data
-                    output.extend(data[pos:])
-                    break
-                
-                marker = data[pos+1]
-                pos += 2
-                
-                # Skip existing XMP APP1 markers
-                if marker == 0xE1:  # APP1
-                    if pos + 2 <= len(data):
-                        length = (data[pos] << 8) | data[pos+1]
-                        if pos + length <= len(data):
-                            segment_data = data[pos+2:pos+length]
-                            if segment_data.startswith(XMP_NAMESPACE):
-                                # Skip this XMP marker
-                                pos += length
-                                continue
-                
-                # For markers with length
-                if marker in [0xC0, 0xC2, 0xC4, 0xDB, 0xDD, 0xDA, 0xFE] or (0xE0 <= marker <= 0xEF):
-                    if pos + 2 > len(data):
-                        break
-                    length = (data[pos] << 8) | data[pos+1]
-                    
-                    # Inject XMP after first APP0/APP1 marker (before other data)
-                    if not xmp_injected and marker in [0xE0, 0xE1]:
-                        output.append(0xFF)
-                        output.append(marker)
-                        output.extend(data[pos:pos+length])
-                        pos += length
-                        
-                        # Now inject our XMP
-                        xmp_data = XMP_NAMESPACE + xmp_packet
-                        xmp_length = len(xmp_data) + 2
-                        if xmp_length <= 0xFFFF:
-                            output.append(0xFF)
-                            output.append(0xE1)
-                            output.append((xmp_length >> 8) & 0xFF)
-                            output.append(xmp_length & 0xFF)
-                            output.extend(xmp_data)
-                            xmp_injected = True
-                        continue
-                    
-                    output.append(0xFF)
-                    output.append(marker)
-                    output.extend(data[pos:pos+length])
-                    pos += length
-                elif marker == 0xD9:  # EOI
-                    # If we haven't injected yet, do it before EOI
-                    if not xmp_injected:
-                        xmp_data = XMP_NAMESPACE + xmp_packet
-                        xmp_length = len(xmp_data) + 2
-                        if xmp_length <= 0xFFFF:
-                            output.append(0xFF)
-                            output.append(0xE1)
-                            output.append((xmp_length >> 8) & 0xFF)
-                            output.append(xmp_length & 0xFF)
-                            output.extend(xmp_data)
-                            xmp_injected = True
-                    output.append(0xFF)
-                    output.append(marker)
-                    break
-                else:
-                    # Standalone marker
-                    output.append(0xFF)
-                    output.append(marker)
-            
-            # Write modified JPEG
-            with open(file_path, 'wb') as f:
-                f.write(output)
-                
+            xmp_data = XMP_APP1_NAMESPACE + xmp_packet
+            if len(xmp_data) + 2 > 0xFFFF:
+                raise ValueError("XMP packet too large for APP1 segment")
+            data = self._remove_xmp_from_jpeg_data(data)
+            _, insert_at = self._jpeg_exif_span(data)
+            segment = b'\xff\xe1' + (len(xmp_data) + 2).to_bytes(2, 'big') + xmp_data
+            return data[:insert_at] + segment + data[insert_at:]
         except Exception as e:
             raise Exception(f"Failed to inject XMP: {str(e)}")
-    
-    def get_naming_conventions(self) -> Dict[str, Any]:
-        """Load all naming conventions from disk."""
-        conventions = {}
-        for naming_file in self.naming_dir.glob("*.json"):
-            try:
-                with open(naming_file, 'r') as f:
-                    data = json.load(f)
-                    conventions[data.get('name', naming_file.stem)] = data
-            except Exception as e:
-                logger.warning(f"Error loading naming convention {naming_file}: {e}")
-        return conventions
-    
-    def save_naming(self, name: str, pattern: str) -> bool:
-        """Save a naming convention."""
-        try:
-            convention = {
-                'name': name,
-                'pattern': pattern,
-                'created': datetime.now().isoformat(),
-            }
-            naming_file = self.naming_dir / f"{name}.json"
-            with open(naming_file, 'w') as f:
-                json.dump(convention, f, indent=2)
-            logger.info(f"Saved naming convention: {name}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving naming convention {name}: {e}")
-            return False
-    
-    def delete_naming(self, name: str) -> bool:
-        """Delete a naming convention."""
-        try:
-            naming_file = self.naming_dir / f"{name}.json"
-            if naming_file.exists():
-                naming_file.unlink()
-                logger.info(f"Deleted naming convention: {name}")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting naming convention {name}: {e}")
-            return False
-    
-    def import_naming(self, data: Dict) -> Tuple[bool, str]:
-        """Import a naming convention from JSON data."""
-        try:
-            name = data.get('name')
-            pattern = data.get('pattern')
-            
-            if not name or not pattern:
-                return False, "Naming convention must have 'name' and 'pattern' fields"
-            
-            return self.save_naming(name, pattern), "Naming convention imported successfully"
-        except Exception as e:
-            return False, f"Import failed: {str(e)}"
-    
-    def _normalize_template_data(self, template: Dict) -> Dict:
-        """Normalize template data for consistency. Strips namespace prefixes from XMP keys."""
-        xmp_data = template.get('xmp', {})
-        
-        # Strip namespace prefixes from XMP keys (e.g., "dc:creator" -> "creator")
-        normalized_xmp = {}
-        for key, value in xmp_data.items():
-            # Remove namespace prefix if present
-            clean_key = key.split(':')[-1] if ':' in key else key
-            normalized_xmp[clean_key] = value
-        
-        return {
-            'exif': template.get('exif', {}),
-            'xmp': normalized_xmp,
-        }
-    
-    def _parse_field_value(self, value: Any) -> Any:
-        """
-        Parse field values with pipe (|) as array separator.
-        E.g., "subject, fun, cap, test" -> ["Subject", "fun", "cap", "test"]
-        E.g., "fun, at the park | Love | I have a cat" -> ["fun, at the park", "Love", "I have a cat"]
-        """
-        if not isinstance(value, str):
-            return value
-        
-        # Check if pipe separator is used
-        if '|' in value:
-            # Split by pipe and strip whitespace, capitalize first element
-            items = [item.strip() for item in value.split('|')]
-            return items
-        
-        # Otherwise, assume comma-separated and split by commas
-        if ',' in value:
-            items = [item.strip() for item in value.split(',')]
-            # Capitalize the first item
-            if items and items[0]:
-                items[0] = items[0].capitalize()
-            return items
-        
+
+
+# NamingEngine token renderers: (file_path, metadata, sequence, now) -> value
+def _tok_date(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return now.strftime('%Y-%m-%d')
+
+
+def _tok_datetime(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return now.isoformat()
+
+
+def _tok_title(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return m.get('xmp', {}).get('title') or m.get('exif', {}).get('ImageDescription') or ''
+
+
+def _tok_camera_model(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return m.get('exif', {}).get('Model') or 'Unknown'
+
+
+def _tok_original_name(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return os.path.splitext(os.path.basename(fp))[0]
+
+
+def _tok_userid(fp: str, m: Dict, i: int, now: datetime) -> str:
+    return USERID
+
+
+class _TokenValues(dict):
+    """str.format_map mapping that renders NamingEngine tokens on first lookup."""
+
+    def __init__(self, engine, file_path: str, metadata: Dict, sequence: int, now: datetime,
+                 datetime_fmt: Optional[str] = None):
+        super().__init__(sequence=sequence, now=now)
+        self.engine = engine
+        self.file_path = file_path
+        self.metadata = metadata
+        self.sequence = sequence
+        self.now = now
+        self.datetime_fmt = datetime_fmt
+
+    def __missing__(self, key: str) -> str:
+        if key == 'datetime_fmt':
+            value = self.engine._render_datetime(self.now, self.datetime_fmt)
+        else:
+            value = self.engine._render_token(key, self.file_path, self.metadata, self.sequence, self.now)
+        self[key] = value
         return value
 
 
 class NamingEngine:
     """Generates filenames using template patterns with token replacement."""
     
-    TOKENS = {
-        'date': lambda fp, m, i: datetime.now().strftime('%Y-%m-%d'),
-        'datetime': lambda fp, m, i: datetime.now().isoformat(),
-        'title': lambda fp, m, i: m.get('xmp', {}).get('title') or m.get('exif', {}).get('ImageDescription') or '',
-        'camera_model': lambda fp, m, i: m.get('exif', {}).get('Model') or 'Unknown',
-        'original_name': lambda fp, m, i: Path(fp).stem,
-        'userid': lambda fp, m, i: os.environ.get('USER') or 'user',
-    }
+    # Read-only token -> renderer table; plain module functions rather than lambdas
+    TOKENS = types.MappingProxyType({
+        'date': _tok_date,
+        'datetime': _tok_datetime,
+        'title': _tok_title,
+        'camera_model': _tok_camera_model,
+        'original_name': _tok_original_name,
+        'userid': _tok_userid,
+    })
     
-    def generate_filename(self, pattern: str, file_path: str, metadata: Dict = None, sequence: int = 1) -> str:
+    # Parametrized tokens, compiled once instead of per generate_filename call
+    DATETIME_TOKEN_RE = re.compile(r'\{datetime:([^}]+)\}')
+    SEQUENCE_TOKEN_RE = re.compile(r'\{sequence(?::(\d+)d)?\}')
+    # Every plain {token} in one alternation so the pattern is scanned once
+    TOKEN_RE = re.compile(r'\{(' + '|'.join(TOKENS) + r')\}')
+    # Tokens whose value is the same for every file in a batch
+    BATCH_TOKENS = frozenset({'date', 'datetime', 'userid'})
+    # The only metadata fields the tokens read; callers pass this as get_metadata(tags=...)
+    METADATA_TAGS = frozenset({'title', 'ImageDescription', 'Model'})
+    # Tokens rendered from the file's metadata; patterns without them need no read
+    METADATA_TOKENS = frozenset({'title', 'camera_model'})
+    # Below this many files a process pool costs more to start than it saves
+    PARALLEL_MIN_FILES = 200
+    
+    def generate_filename(self, pattern: str, file_path: str, metadata: Dict = None, sequence: int = 1,
+                          now: Optional[datetime] = None) -> str:
         """
         Generate a new filename based on pattern and metadata.
         
@@ -641,47 +1139,200 @@ class NamingEngine:
             {sequence:03d} -> sequence number with padding
             {original_name} -> original filename without extension
             {userid} -> current user
+
+        All date tokens share one timestamp: now, or the current time when omitted
+        (batch callers can pass the same value for every file).
         """
         if not metadata:
             metadata = {'exif': {}, 'xmp': {}}
-        
-        result = pattern
-        
-        # Handle {datetime:%format} - strftime formatting
-        datetime_match = re.search(r'\{datetime:([^}]+)\}', result)
+        if now is None:
+            now = datetime.now()
+        # The pattern is compiled once into a str.format template; format_map then
+        # applies the datetime/sequence specs natively and renders only the tokens used
+        template, datetime_fmt = self._compile_format(pattern)
+        values = _TokenValues(self, file_path, metadata, sequence, now, datetime_fmt)
+        return template.format_map(values) + os.path.splitext(file_path)[1]
+
+    def generate_filenames(self, pattern: str, file_paths: List[str], metadatas: List[Dict] = None,
+                           start_sequence: int = 1, now: Optional[datetime] = None) -> List[str]:
+        """
+        Generate filenames for many files from one pattern.
+
+        The pattern is parsed once and the file-independent tokens are rendered
+        once for the whole batch; sequence numbers count up from start_sequence.
+        metadatas, when given, is aligned with file_paths.
+        """
+        if now is None:
+            now = datetime.now()
+        segments = self._compile_pattern(pattern)
+        empty_metadata = {'exif': {}, 'xmp': {}}
+
+        # Render values shared by every file once and fold them into the
+        # neighbouring literals, so each file's join only touches varying parts
+        batch_segments = []
+        for segment in segments:
+            if type(segment) is not str:
+                kind, arg = segment
+                if kind == 'datetime':
+                    segment = self._render_datetime(now, arg)
+                elif kind == 'token' and arg in self.BATCH_TOKENS:
+                    segment = self._render_token(arg, '', empty_metadata, start_sequence, now)
+            if type(segment) is str and batch_segments and type(batch_segments[-1]) is str:
+                batch_segments[-1] += segment
+            else:
+                batch_segments.append(segment)
+
+        template, _ = self._segments_to_format(batch_segments)
+        return [
+            template.format_map(_TokenValues(self, file_path,
+                                             (metadatas[offset] if metadatas else None) or empty_metadata,
+                                             start_sequence + offset, now))
+            + os.path.splitext(file_path)[1]
+            for offset, file_path in enumerate(file_paths)
+        ]
+
+    @staticmethod
+    def _render_datetime(now: datetime, fmt: str) -> str:
+        """Render a {datetime:fmt} token, falling back to ISO format."""
+        try:
+            return now.strftime(fmt)
+        except Exception:
+            return now.isoformat()
+
+    def generate_filenames_parallel(self, pattern: str, file_paths: List[str], metadatas: List[Dict] = None,
+                                    start_sequence: int = 1, workers: Optional[int] = None,
+                                    now: Optional[datetime] = None) -> List[str]:
+        """
+        Like generate_filenames, but splits large batches across a process pool.
+
+        Every chunk shares one timestamp and keeps its place in the sequence, so
+        the result is identical to the serial call.
+        """
+        file_paths = list(file_paths)
+        if now is None:
+            now = datetime.now()
+        if len(file_paths) < self.PARALLEL_MIN_FILES:
+            return self.generate_filenames(pattern, file_paths, metadatas, start_sequence, now)
+
+        workers = workers or os.cpu_count() or 1
+        chunk_size = max(1, len(file_paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=PROCESS_POOL_CONTEXT) as executor:
+            futures = [
+                executor.submit(_generate_filename_chunk, pattern, file_paths[begin:begin + chunk_size],
+                                metadatas[begin:begin + chunk_size] if metadatas else None,
+                                start_sequence + begin, now)
+                for begin in range(0, len(file_paths), chunk_size)
+            ]
+            names = []
+            for future in futures:
+                names.extend(future.result())
+        return names
+
+    @classmethod
+    def uses_metadata(cls, pattern: str) -> bool:
+        """True when pattern contains a token that needs the file's metadata."""
+        return any(type(segment) is not str and segment[0] == 'token' and segment[1] in cls.METADATA_TOKENS
+                   for segment in cls._compile_pattern(pattern))
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_format(cls, pattern: str) -> Tuple[str, Optional[str]]:
+        """Compile pattern into a cached str.format_map template (see _segments_to_format)."""
+        return cls._segments_to_format(cls._compile_pattern(pattern))
+
+    @staticmethod
+    def _segments_to_format(segments) -> Tuple[str, Optional[str]]:
+        """
+        Turn compiled segments into a str.format_map template.
+
+        Literal braces are escaped, tokens become named fields, and the sequence
+        and datetime specs are passed to int/datetime __format__ directly. A
+        datetime format that cannot be used as a format spec is returned alongside
+        and rendered through the {datetime_fmt} field instead.
+        """
+        fields = []
+        datetime_fmt = None
+        for segment in segments:
+            if type(segment) is str:
+                fields.append(segment.replace('{', '{{').replace('}', '}}'))
+                continue
+            kind, arg = segment
+            if kind == 'token':
+                fields.append('{' + arg + '}')
+            elif kind == 'sequence':
+                fields.append('{sequence:' + arg + '}' if arg else '{sequence}')
+            else:
+                native = '{' not in arg
+                if native:
+                    try:
+                        datetime(2000, 1, 1).strftime(arg)
+                    except Exception:
+                        native = False
+                if native:
+                    fields.append('{now:' + arg + '}')
+                else:
+                    datetime_fmt = arg
+                    fields.append('{datetime_fmt}')
+        return ''.join(fields), datetime_fmt
+
+    @classmethod
+    @functools.lru_cache(maxsize=256)
+    def _compile_pattern(cls, pattern: str) -> Tuple[Any, ...]:
+        """
+        Split pattern into literal strings and (kind, arg) token descriptors.
+
+        Only the first {datetime:fmt} format is expanded, then {sequence[:Nd]},
+        then the plain TOKENS. Results are cached per pattern.
+        """
+        datetime_match = cls.DATETIME_TOKEN_RE.search(pattern)
         if datetime_match:
-            fmt = datetime_match.group(1)
-            try:
-                value = datetime.now().strftime(fmt)
-            except Exception:
-                value = datetime.now().isoformat()
-            result = result.replace(datetime_match.group(0), value)
-        
-        # Handle {sequence} and {sequence:NNd} for zero-padded numbering
-        def _seq_repl(match: re.Match) -> str:
-            width = match.group(1)
-            if width:
-                try:
-                    return f"{sequence:0{int(width)}d}"
-                except Exception:
-                    return str(sequence)
-            return str(sequence)
-        result = re.sub(r"\{sequence(?::(\d+)d)?\}", _seq_repl, result)
-        
-        # Handle standard tokens
-        for token, func in self.TOKENS.items():
-            placeholder = '{' + token + '}'
-            if placeholder in result:
-                try:
-                    value = func(file_path, metadata, sequence)
-                    result = result.replace(placeholder, str(value))
-                except Exception as e:
-                    logger.debug(f"Error generating token {token}: {e}")
-                    result = result.replace(placeholder, '')
-        
-        # Append original extension
-        ext = Path(file_path).suffix
-        return result + ext
+            pieces = pattern.split(datetime_match.group(0))
+            segments = [pieces[0]]
+            for piece in pieces[1:]:
+                segments.append(('datetime', datetime_match.group(1)))
+                segments.append(piece)
+        else:
+            segments = [pattern]
+        segments = cls._split_segments(segments, cls.SEQUENCE_TOKEN_RE, 'sequence')
+        segments = cls._split_segments(segments, cls.TOKEN_RE, 'token')
+        return tuple(segments)
+
+    @staticmethod
+    def _split_segments(segments: List[Any], regex: re.Pattern, kind: str) -> List[Any]:
+        """Split the literal segments on a single-group token regex."""
+        result = []
+        for segment in segments:
+            if type(segment) is not str:
+                result.append(segment)
+                continue
+            # re.split puts the captured group at every odd index
+            for index, part in enumerate(regex.split(segment)):
+                if index % 2:
+                    if kind == 'sequence':
+                        # The width is digits-only, so the spec is valid by construction
+                        # and is built once here rather than per rendered name
+                        part = f"0{int(part)}d" if part else None
+                    elif kind == 'token':
+                        # Share the TOKENS key object so dispatch lookups hit on identity
+                        part = sys.intern(part)
+                    result.append((kind, part))
+                elif part:
+                    result.append(part)
+        return result
+
+    def _render_token(self, token: str, file_path: str, metadata: Dict, sequence: int, now: datetime) -> str:
+        """Render one plain token; failures render as an empty string."""
+        try:
+            return str(self.TOKENS[token](file_path, metadata, sequence, now)).translate(FILENAME_SANITIZE_TABLE)
+        except Exception as e:
+            logger.debug(f"Error generating token {token}: {e}")
+            return ''
+
+
+def _generate_filename_chunk(pattern: str, file_paths: List[str], metadatas: Optional[List[Dict]],
+                             start_sequence: int, now: datetime) -> List[str]:
+    """Process-pool entry point for NamingEngine.generate_filenames_parallel."""
+    return NamingEngine().generate_filenames(pattern, file_paths, metadatas, start_sequence, now)
 
 
 class TemplateManager:
@@ -691,9 +1342,16 @@ class TemplateManager:
         self.naming_dir = Path.home() / '.photo_meta_editor' / 'naming'
         self.template_dir.mkdir(parents=True, exist_ok=True)
         self.naming_dir.mkdir(parents=True, exist_ok=True)
+        # directory -> (st_mtime_ns at scan time, {name: data}, {name: file path})
+        self._indexes: Dict[Path, Tuple[int, Dict[str, Dict], Dict[str, str]]] = {}
+        self._io_pool: Optional[ThreadPoolExecutor] = None
         self._create_default_templates()
 
     def _create_default_templates(self):
+        # One stat on later launches instead of checking every default file
+        sentinel = self.template_dir / '.defaults_created'
+        if sentinel.exists():
+            return
         portrait = {
             "name": "Portrait Template",
             "exif": {
@@ -730,47 +1388,174 @@ class TemplateManager:
         }
         self._save_naming_if_not_exists("date_title.json", naming1)
         self._save_naming_if_not_exists("timestamp_camera.json", naming2)
+        sentinel.touch()
 
     def _save_template_if_not_exists(self, filename: str, template: Dict):
         path = self.template_dir / filename
         if not path.exists():
-            with open(path, 'w') as f:
-                json.dump(template, f, indent=2)
+            self._write_json(path, template)
 
     def _save_naming_if_not_exists(self, filename: str, naming: Dict):
         path = self.naming_dir / filename
         if not path.exists():
-            with open(path, 'w') as f:
-                json.dump(naming, f, indent=2)
+            self._write_json(path, naming)
+
+    @staticmethod
+    def _read_json(path) -> Any:
+        with open(path, 'rb') as f:
+            return TemplateManager._parse_json(f.read())
+
+    @staticmethod
+    def _parse_json(data) -> Any:
+        """Parse JSON from bytes or str; orjson's decode errors subclass json.JSONDecodeError."""
+        return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict) -> None:
+        # Serialize once, then swap in via rename so readers never see a partial file
+        if HAS_ORJSON:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode('utf-8')
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _json_files(directory: Path) -> List[str]:
+        """List the *.json files in directory; scandir reuses its cached d_type instead of re-stating."""
+        with os.scandir(directory) as it:
+            return [entry.path for entry in it
+                    if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)]
+
+    @staticmethod
+    def _file_stem(path: str) -> str:
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def _load_json_files(self, paths: List[str]) -> List[Tuple[str, Future]]:
+        """
+        Read and parse JSON files concurrently to overlap disk latency.
+        Returns (path, future) pairs in input order; future.result() re-raises load errors.
+        """
+        if not paths:
+            return []
+        executor = self._get_io_pool()
+        return [(path, executor.submit(self._read_json, path)) for path in paths]
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        """
+        Return the thread pool used for JSON loads, starting it on first use.
+        Its threads stay idle between rescans instead of being started and joined
+        for every one.
+        """
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=32)
+        return self._io_pool
+
+    def _fresh_index(self, directory: Path, loader) -> Tuple[Optional[int], Dict[str, Dict], Dict[str, str]]:
+        """
+        Return the (mtime, {name: data}, {name: path}) index for directory, calling
+        loader() to rescan only when the directory's mtime has changed (files added,
+        removed or replaced).
+        """
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = self._indexes.get(directory)
+        if cached is None or mtime is None or cached[0] != mtime:
+            cached = (mtime,) + loader()
+            if mtime is not None:
+                self._indexes[directory] = cached
+        return cached
+
+    def _cached_index(self, directory: Path, loader) -> Dict[str, Dict]:
+        # Hand out copies so callers cannot edit the index
+        return {name: dict(data) for name, data in self._fresh_index(directory, loader)[1].items()}
+
+    def _update_index(self, directory: Path, name: str, data: Optional[Dict], path: Optional[Path] = None):
+        """Apply our own save (data, path) or delete (None) to the index without a rescan."""
+        cached = self._indexes.get(directory)
+        if cached is None:
+            return
+        _, index, files = cached
+        if data is None:
+            index.pop(name, None)
+            files.pop(name, None)
+        else:
+            # A save can overwrite the file of an entry with a differently cased name
+            for other in [n for n, f in files.items() if f == str(path) and n != name]:
+                index.pop(other, None)
+                files.pop(other, None)
+            index[name] = data
+            files[name] = str(path)
+        try:
+            self._indexes[directory] = (directory.stat().st_mtime_ns, index, files)
+        except OSError:
+            self._indexes.pop(directory, None)
+
+    def _delete_indexed(self, directory: Path, loader, name: str) -> bool:
+        """Delete the file holding entry name, found through the index rather than by parsing every file."""
+        path = self._fresh_index(directory, loader)[2].get(name)
+        if path is None:
+            return False
+        os.unlink(path)
+        self._update_index(directory, name, None)
+        return True
 
     def get_templates(self) -> Dict[str, Dict]:
+        return self._cached_index(self.template_dir, self._load_templates)
+
+    def get_naming_conventions(self) -> Dict[str, Dict]:
+        return self._cached_index(self.naming_dir, self._load_naming_conventions)
+
+    def get_template(self, name: str) -> Optional[Dict]:
+        """Return a copy of one template, or None, without copying the whole index."""
+        data = self._fresh_index(self.template_dir, self._load_templates)[1].get(name)
+        return dict(data) if data is not None else None
+
+    def get_naming_convention(self, name: str) -> Optional[Dict]:
+        """Return a copy of one naming convention, or None, without copying the whole index."""
+        data = self._fresh_index(self.naming_dir, self._load_naming_conventions)[1].get(name)
+        return dict(data) if data is not None else None
+
+    def get_template_names(self) -> List[str]:
+        return list(self._fresh_index(self.template_dir, self._load_templates)[1])
+
+    def get_naming_names(self) -> List[str]:
+        return list(self._fresh_index(self.naming_dir, self._load_naming_conventions)[1])
+
+    def _load_templates(self) -> Tuple[Dict[str, Dict], Dict[str, str]]:
         templates = {}
+        files = {}
         try:
-            for file in self.template_dir.glob('*.json'):
+            for file, future in self._load_json_files(self._json_files(self.template_dir)):
                 try:
-                    with open(file, 'r') as f:
-                        data = json.load(f)
-                        normalized = self._normalize_template_data(data)
-                        templates[normalized.get('name', file.stem)] = normalized
+                    normalized = self._normalize_template_data(future.result())
+                    name = normalized['name'] if 'name' in normalized else self._file_stem(file)
+                    templates[name] = normalized
+                    files[name] = file
                 except Exception as e:
                     logger.warning(f"Error loading template {file}: {e}")
         except Exception as e:
             logger.error(f"Error reading templates: {e}")
-        return templates
+        return templates, files
 
-    def get_naming_conventions(self) -> Dict[str, Dict]:
+    def _load_naming_conventions(self) -> Tuple[Dict[str, Dict], Dict[str, str]]:
         conventions = {}
+        files = {}
         try:
-            for file in self.naming_dir.glob('*.json'):
+            for file, future in self._load_json_files(self._json_files(self.naming_dir)):
                 try:
-                    with open(file, 'r') as f:
-                        data = json.load(f)
-                        conventions[data.get('name', file.stem)] = data
+                    data = future.result()
+                    name = data['name'] if 'name' in data else self._file_stem(file)
+                    conventions[name] = data
+                    files[name] = file
                 except Exception as e:
                     logger.warning(f"Error loading naming convention {file}: {e}")
         except Exception as e:
             logger.error(f"Error reading naming conventions: {e}")
-        return conventions
+        return conventions, files
 
     def save_template(self, name: str, exif: Dict, xmp: Dict) -> bool:
         try:
@@ -781,8 +1566,8 @@ class TemplateManager:
             }
             filename = name.lower().replace(' ', '_') + '.json'
             path = self.template_dir / filename
-            with open(path, 'w') as f:
-                json.dump(template, f, indent=2)
+            self._write_json(path, template)
+            self._update_index(self.template_dir, name, self._normalize_template_data(dict(template)), path)
             logger.info(f"Template saved: {name}")
             return True
         except Exception as e:
@@ -797,34 +1582,60 @@ class TemplateManager:
             }
             filename = name.lower().replace(' ', '_') + '.json'
             path = self.naming_dir / filename
-            with open(path, 'w') as f:
-                json.dump(naming, f, indent=2)
+            self._write_json(path, naming)
+            self._update_index(self.naming_dir, name, naming, path)
             logger.info(f"Naming convention saved: {name}")
             return True
         except Exception as e:
             logger.error(f"Error saving naming convention: {e}")
             return False
 
+    def update_template(self, old_name: str, new_name: str, exif: Dict, xmp: Dict) -> bool:
+        """
+        Replace template old_name with new_name's data. The new file is written
+        (atomically) before the old one is removed, and when both names map to
+        the same file that single write is the whole update.
+        """
+        try:
+            old_path = self._fresh_index(self.template_dir, self._load_templates)[2].get(old_name)
+            if not self.save_template(new_name, exif, xmp):
+                return False
+            self._drop_replaced(self.template_dir, old_name, new_name, old_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating template: {e}")
+            return False
+
+    def update_naming(self, old_name: str, new_name: str, pattern: str) -> bool:
+        """Replace naming convention old_name with new_name; see update_template."""
+        try:
+            old_path = self._fresh_index(self.naming_dir, self._load_naming_conventions)[2].get(old_name)
+            if not self.save_naming(new_name, pattern):
+                return False
+            self._drop_replaced(self.naming_dir, old_name, new_name, old_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating naming convention {old_name}: {e}")
+            return False
+
+    def _drop_replaced(self, directory: Path, old_name: str, new_name: str, old_path: Optional[str]):
+        """Remove old_name's file after new_name was saved, unless the save overwrote it."""
+        new_path = str(directory / (new_name.lower().replace(' ', '_') + '.json'))
+        if old_path is not None and old_path != new_path:
+            os.unlink(old_path)
+        if old_name != new_name:
+            self._update_index(directory, old_name, None)
+
     def delete_template(self, name: str) -> bool:
         try:
-            for file in self.template_dir.glob('*.json'):
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                    if data.get('name') == name:
-                        file.unlink()
-                        return True
+            return self._delete_indexed(self.template_dir, self._load_templates, name)
         except Exception as e:
             logger.error(f"Error deleting template: {e}")
         return False
 
     def delete_naming(self, name: str) -> bool:
         try:
-            for file in self.naming_dir.glob('*.json'):
-                with open(file, 'r') as f:
-                    data = json.load(f)
-                    if data.get('name') == name:
-                        file.unlink()
-                        return True
+            return self._delete_indexed(self.naming_dir, self._load_naming_conventions, name)
         except Exception as e:
             logger.error(f"Error deleting naming convention {name}: {e}")
         return False
@@ -846,18 +1657,20 @@ class TemplateManager:
 
     def import_naming(self, data: Dict) -> Tuple[bool, str]:
         try:
-            if 'name' not in data:
-                return False, "Naming convention must have a 'name' field"
-            if 'pattern' not in data:
-                return False, "Naming convention must have a 'pattern' field"
+            # Direct lookups; a missing field is the rare path
             name = data['name']
             pattern = data['pattern']
-            if self.save_naming(name, pattern):
-                return True, f"Naming convention '{name}' imported successfully"
-            else:
-                return False, "Failed to save naming convention"
+        except KeyError as e:
+            return False, f"Naming convention must have a '{e.args[0]}' field"
         except Exception as e:
             return False, f"Import error: {str(e)}"
+        if self.save_naming(name, pattern):
+            return True, f"Naming convention '{name}' imported successfully"
+        return False, "Failed to save naming convention"
+
+    def import_namings(self, items: List[Dict]) -> List[Tuple[bool, str]]:
+        """Import several naming conventions (e.g. a JSON bundle); one result per item."""
+        return [self.import_naming(data) for data in items]
 
     @staticmethod
     def _normalize_template_data(data: Dict) -> Dict:
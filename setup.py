@@ -24,7 +24,7 @@ OPTIONS = {
         'NSHumanReadableCopyright': '© 2025 Michael Gledhill',
         'NSHighResolutionCapable': True,
     },
-    'packages': ['PySide6', 'PIL', 'piexif'],
+    'packages': ['PySide6', 'PIL', 'piexif', 'packaging'],
     'includes': ['metadata_handler', 'gui', 'update_checker'],
     'resources': ['assets', 'storage', 'version.txt'],
     'excludes': ['tkinter', 'matplotlib', 'numpy', 'scipy'],
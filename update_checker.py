@@ -4,70 +4,183 @@ Update checker for Photo Metadata Editor.
 Checks for updates from GitHub and handles app updates.
 """
 
+import os
 import json
+import time
+import functools
+import hashlib
+import shutil
+import tempfile
 import subprocess
 import sys
 import logging
 import ssl
+import stat
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from packaging.version import InvalidVersion, Version
 
 try:
     import certifi  # type: ignore
 except ImportError:  # certifi is optional; we fall back to system certs
     certifi = None
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 GITHUB_REPO = "michael6gledhill/Photo_Metadata_App_By_Gledhill"
 RELEASES_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest"
 RAW_VERSION_URL = "https://raw.githubusercontent.com/michael6gledhill/Photo_Metadata_App_By_Gledhill/main/version.txt"
 GITHUB_PAGES_URL = "https://michael6gledhill.github.io/Photo_Metadata_App_By_Gledhill/"
+# Latest version seen by the last successful check, reused by background checks
+UPDATE_CACHE_PATH = Path.home() / '.photo_meta_editor' / 'update_cache.json'
+# Seconds a cached latest version is trusted before GitHub is asked again
+UPDATE_CACHE_TTL = 6 * 3600
+# Output of the git/pip steps of the last update, streamed here instead of into memory
+UPDATE_LOG_PATH = Path.home() / '.photo_meta_editor' / 'update.log'
+# Bytes from the end of UPDATE_LOG_PATH included in the error when an update step fails
+UPDATE_LOG_TAIL_BYTES = 8192
+# App checkout that perform_update fetches into
+REPO_PATH = Path(__file__).parent
+# Installed version, written by save_current_version after an update
+VERSION_FILE = REPO_PATH / "version.txt"
+# git resolved once at import rather than searched for on PATH by every update step
+GIT_EXECUTABLE = shutil.which("git")
+if GIT_EXECUTABLE is None:
+    logger.warning("git was not found on PATH; installing updates will fail")
+    GIT_EXECUTABLE = "git"
+
+
+def _replace_file(path: Path, text: str):
+    """Write text to a temp file beside path, then atomically swap it into place."""
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp creates the file private; keep the permissions of the file being replaced
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=1)
+def _read_version_file() -> str:
+    # One open instead of an exists() probe and a read; cleared when the file is rewritten
+    try:
+        return VERSION_FILE.read_text().strip()
+    except FileNotFoundError:
+        return "1.0.0"
+
+
+def _parse_json(data: bytes) -> Any:
+    """Parse JSON straight from bytes; orjson's decode errors subclass json.JSONDecodeError."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_version(version: str) -> Optional[Version]:
+    # Each version string is parsed once; the same few are compared on every check
+    try:
+        return Version(version)
+    except (InvalidVersion, TypeError):
+        logger.debug(f"Ignoring unparseable version: {version!r}")
+        return None
 
 
 class UpdateChecker:
     """Checks for app updates and manages the update process."""
+
+    # insecure flag -> SSL context shared by every fetch in this process
+    _SSL_CONTEXTS: Dict[bool, ssl.SSLContext] = {}
     
     def __init__(self):
         self.current_version = self.get_current_version()
         self.latest_version = None
         self.update_available = False
         self.last_error: Optional[str] = None
+        # source -> last error reported by that fetcher during the current check
+        self._errors: Dict[str, str] = {}
+        # source -> {'etag', 'version'} from the last check, sent back as If-None-Match
+        self._validators: Dict[str, dict] = {}
+        # source -> ETag returned by that source during the current check
+        self._etags: Dict[str, str] = {}
+        # Single worker for check_for_updates_async, started on first use
+        self._async_executor: Optional[ThreadPoolExecutor] = None
+        # Latest async check and whether it was forced; later calls join it while it runs
+        self._pending_check: Optional[Future] = None
+        self._pending_force = False
+        self._async_lock = threading.Lock()
+        # (time.monotonic() deadline, latest version) so repeat checks skip even the cache file
+        self._remembered_version: Optional[Tuple[float, str]] = None
         
     @staticmethod
     def get_current_version() -> str:
         """Get the current app version from package metadata."""
         # Read from a simple version.txt file or return a default
-        version_file = Path(__file__).parent / "version.txt"
-        if version_file.exists():
-            return version_file.read_text().strip()
-        return "1.0.0"
+        return _read_version_file()
     
     @staticmethod
     def save_current_version(version: str):
         """Save the current version to a file."""
-        version_file = Path(__file__).parent / "version.txt"
-        version_file.write_text(version)
+        # Replaced rather than rewritten in place, so a reader never sees it empty
+        _replace_file(VERSION_FILE, version)
+        _read_version_file.cache_clear()
     
-    def check_for_updates(self) -> Tuple[bool, Optional[str]]:
+    def check_for_updates(self, force: bool = False) -> Tuple[bool, Optional[str]]:
         """
         Check GitHub for the latest version.
+        A result cached within UPDATE_CACHE_TTL, in memory or on disk, is used instead
+        unless force is set.
         Returns: (update_available, latest_version)
         """
         # Reset state before each check so stale flags don't persist
         self.last_error = None
         self.update_available = False
         self.latest_version = None
+
+        if not force:
+            remembered = self._remembered_version
+            if remembered and time.monotonic() < remembered[0]:
+                return self._apply_latest_version(remembered[1], "memory")
+
+        cache = self._read_update_cache()
+        if not force:
+            cached_version = self._read_cached_version(cache)
+            if cached_version:
+                self._remember_version(cached_version, cache['checked_at'] + UPDATE_CACHE_TTL - time.time())
+                return self._apply_latest_version(cached_version, "cache")
+
         candidates = []
 
-        release_version = self._fetch_latest_release_version()
+        # Both sources are fetched at once, so the check takes as long as the slower one
+        self._errors = {}
+        self._etags = {}
+        validators = cache.get('validators')
+        self._validators = validators if isinstance(validators, dict) else {}
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            release_future = executor.submit(self._fetch_latest_release_version)
+            raw_version = self._fetch_latest_raw_version()
+            release_version = release_future.result()
+        # Same precedence as fetching one after the other: the raw source's error wins
+        self.last_error = self._errors.get("raw") or self._errors.get("release")
+
         if release_version:
             candidates.append(("release", release_version))
-
-        raw_version = self._fetch_latest_raw_version()
         if raw_version:
             candidates.append(("raw", raw_version))
 
@@ -81,6 +194,20 @@ class UpdateChecker:
             if self._compare_versions(version, latest_version) > 0:
                 latest_source, latest_version = source, version
 
+        validators = {source: {'etag': self._etags[source], 'version': version}
+                      for source, version in candidates if source in self._etags}
+        # Other keys (the requirements hash) are carried over from the loaded cache
+        cache.update(checked_at=time.time(), latest_version=latest_version, validators=validators)
+        self._write_update_cache(cache)
+        self._remember_version(latest_version, UPDATE_CACHE_TTL)
+        return self._apply_latest_version(latest_version, latest_source)
+
+    def _remember_version(self, latest_version: str, ttl: float):
+        """Keep latest_version in memory for the next ttl seconds."""
+        self._remembered_version = (time.monotonic() + ttl, latest_version)
+
+    def _apply_latest_version(self, latest_version: str, latest_source: str) -> Tuple[bool, Optional[str]]:
+        """Record latest_version (found via latest_source) and compare it with the running version."""
         self.latest_version = latest_version
 
         if self._compare_versions(self.latest_version, self.current_version) > 0:
@@ -91,73 +218,143 @@ class UpdateChecker:
         logger.info(f"No update available. Current: {self.current_version}, Latest: {self.latest_version}")
         return False, self.latest_version
 
+    @staticmethod
+    def _read_update_cache() -> dict:
+        """Return the update cache contents, or an empty dict if it is missing or unreadable."""
+        try:
+            cache = _parse_json(UPDATE_CACHE_PATH.read_bytes())
+            if isinstance(cache, dict):
+                return cache
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable update cache: {e}")
+        return {}
+
+    @staticmethod
+    def _read_cached_version(cache: dict) -> Optional[str]:
+        """Return the cached latest version if it is younger than UPDATE_CACHE_TTL."""
+        try:
+            age = time.time() - cache['checked_at']
+            if 0 <= age < UPDATE_CACHE_TTL:
+                return cache['latest_version'] or None
+        except (KeyError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _write_update_cache(cache: dict):
+        """Write cache to the update cache file, replacing it atomically."""
+        try:
+            UPDATE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _replace_file(UPDATE_CACHE_PATH, json.dumps(cache))
+        except Exception as e:
+            logger.debug(f"Could not write update cache: {e}")
+
     def _fetch_latest_release_version(self) -> Optional[str]:
-        req = Request(RELEASES_API_URL, headers={"User-Agent": "PhotoMetadataEditor-Updater"})
+        req = self._build_request("release", RELEASES_API_URL)
         try:
-            with urlopen(req, timeout=6, context=self._get_ssl_context()) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                return data.get('tag_name', '').lstrip('v') or None
+            body = self._open(req, "release")
+            if body is None:
+                return self._not_modified("release")
+            data = _parse_json(body)
+            return data.get('tag_name', '').lstrip('v') or None
         except URLError as e:
             # Retry once with insecure SSL if certs are broken locally
             if isinstance(getattr(e, "reason", None), ssl.SSLError):
-                self.last_error = f"Releases API SSL failed: {e}"  # keep the real cause
-                logger.warning(self.last_error)
+                self._report_error("release", f"Releases API SSL failed: {e}")  # keep the real cause
                 try:
-                    with urlopen(req, timeout=6, context=self._get_ssl_context(insecure=True)) as response:
-                        data = json.loads(response.read().decode('utf-8'))
-                        logger.warning("Releases API succeeded with insecure SSL fallback; please fix system certificates.")
-                        return data.get('tag_name', '').lstrip('v') or None
+                    body = self._open(req, "release", insecure=True)
+                    logger.warning("Releases API succeeded with insecure SSL fallback; please fix system certificates.")
+                    if body is None:
+                        return self._not_modified("release")
+                    data = _parse_json(body)
+                    return data.get('tag_name', '').lstrip('v') or None
                 except Exception as inner:
-                    self.last_error = f"Releases API insecure fallback failed: {inner}"
-                    logger.warning(self.last_error)
+                    self._report_error("release", f"Releases API insecure fallback failed: {inner}")
                     return None
-            self.last_error = f"Releases API failed: {e}"
-            logger.warning(self.last_error)
+            self._report_error("release", f"Releases API failed: {e}")
             return None
         except (HTTPError, json.JSONDecodeError, KeyError) as e:
-            self.last_error = f"Releases API failed: {e}"
-            logger.warning(self.last_error)
+            self._report_error("release", f"Releases API failed: {e}")
             return None
 
     def _fetch_latest_raw_version(self) -> Optional[str]:
-        req = Request(RAW_VERSION_URL, headers={"User-Agent": "PhotoMetadataEditor-Updater"})
+        req = self._build_request("raw", RAW_VERSION_URL)
         try:
-            with urlopen(req, timeout=6, context=self._get_ssl_context()) as response:
-                text = response.read().decode('utf-8').strip()
-                return text or None
+            body = self._open(req, "raw")
+            if body is None:
+                return self._not_modified("raw")
+            return body.decode('utf-8').strip() or None
         except URLError as e:
             if isinstance(getattr(e, "reason", None), ssl.SSLError):
-                self.last_error = f"Raw version SSL failed: {e}"
-                logger.warning(self.last_error)
+                self._report_error("raw", f"Raw version SSL failed: {e}")
                 try:
-                    with urlopen(req, timeout=6, context=self._get_ssl_context(insecure=True)) as response:
-                        text = response.read().decode('utf-8').strip()
-                        logger.warning("Raw version fetch succeeded with insecure SSL fallback; please fix system certificates.")
-                        return text or None
+                    body = self._open(req, "raw", insecure=True)
+                    logger.warning("Raw version fetch succeeded with insecure SSL fallback; please fix system certificates.")
+                    if body is None:
+                        return self._not_modified("raw")
+                    return body.decode('utf-8').strip() or None
                 except Exception as inner:
-                    self.last_error = f"Raw version insecure fallback failed: {inner}"
-                    logger.warning(self.last_error)
+                    self._report_error("raw", f"Raw version insecure fallback failed: {inner}")
                     return None
-            self.last_error = f"Raw version fetch failed: {e}"
-            logger.warning(self.last_error)
+            self._report_error("raw", f"Raw version fetch failed: {e}")
             return None
         except Exception as e:
-            self.last_error = f"Raw version fetch failed: {e}"
-            logger.warning(self.last_error)
+            self._report_error("raw", f"Raw version fetch failed: {e}")
             return None
 
-    @staticmethod
-    def _get_ssl_context(insecure: bool = False):
+    def _build_request(self, source: str, url: str) -> Request:
+        """Build a GET for url, made conditional on the ETag source returned last time."""
+        headers = {"User-Agent": "PhotoMetadataEditor-Updater"}
+        validator = self._validators.get(source)
+        if isinstance(validator, dict) and validator.get('etag') and validator.get('version'):
+            headers["If-None-Match"] = validator['etag']
+        return Request(url, headers=headers)
+
+    def _open(self, req: Request, source: str, insecure: bool = False) -> Optional[bytes]:
+        """Return the response body for req, or None if the server answered 304 Not Modified."""
+        try:
+            with urlopen(req, timeout=6, context=self._get_ssl_context(insecure=insecure)) as response:
+                etag = response.headers.get('ETag')
+                body = response.read()
+        except HTTPError as e:
+            if e.code == 304:
+                self._etags[source] = req.get_header("If-none-match")
+                return None
+            raise
+        if etag:
+            self._etags[source] = etag
+        return body
+
+    def _not_modified(self, source: str) -> Optional[str]:
+        """Return the version source reported last time, which a 304 says is still current."""
+        logger.debug(f"{source} version unchanged since last check (304)")
+        return self._validators[source]['version']
+
+    def _report_error(self, source: str, message: str):
+        """Log a fetch failure and keep it as source's error for this check."""
+        logger.warning(message)
+        self._errors[source] = message
+
+    @classmethod
+    def _get_ssl_context(cls, insecure: bool = False):
         """Return an SSL context that trusts certifi if available, or optionally disable verification."""
+        # Built once per process so the certifi bundle is parsed once, not per request
+        ctx = cls._SSL_CONTEXTS.get(insecure)
+        if ctx is not None:
+            return ctx
         if insecure:
-            return ssl._create_unverified_context()
-        ctx = ssl.create_default_context()
-        if certifi:
-            try:
-                ctx.load_verify_locations(certifi.where())
-            except Exception:
-                # If loading certifi fails, continue with default context
-                pass
+            ctx = ssl._create_unverified_context()
+        else:
+            ctx = ssl.create_default_context()
+            if certifi:
+                try:
+                    ctx.load_verify_locations(certifi.where())
+                except Exception:
+                    # If loading certifi fails, continue with default context
+                    pass
+        cls._SSL_CONTEXTS[insecure] = ctx
         return ctx
     
     @staticmethod
@@ -165,24 +362,12 @@ class UpdateChecker:
         """
         Compare two version strings.
         Returns: 1 if version1 > version2, -1 if version1 < version2, 0 if equal
+        Pre-releases sort before their release (1.2.0rc1 < 1.2.0); unparseable versions compare equal.
         """
-        try:
-            v1_parts = [int(x) for x in version1.split('.')]
-            v2_parts = [int(x) for x in version2.split('.')]
-            
-            # Pad shorter version with zeros
-            max_len = max(len(v1_parts), len(v2_parts))
-            v1_parts += [0] * (max_len - len(v1_parts))
-            v2_parts += [0] * (max_len - len(v2_parts))
-            
-            for v1, v2 in zip(v1_parts, v2_parts):
-                if v1 > v2:
-                    return 1
-                elif v1 < v2:
-                    return -1
-            return 0
-        except (ValueError, AttributeError):
+        v1, v2 = _parse_version(version1), _parse_version(version2)
+        if v1 is None or v2 is None:
             return 0
+        return (v1 > v2) - (v1 < v2)
     
     def perform_update(self) -> bool:
         """
@@ -190,25 +375,61 @@ class UpdateChecker:
         Returns: True if successful, False otherwise
         """
         try:
-            repo_path = Path(__file__).parent
+            # Nothing to pull or install when the running version is already the latest;
+            # if the latest version cannot be determined, update as before
+            if not self.latest_version:
+                self.check_for_updates()
+            if self.latest_version and self._compare_versions(self.latest_version, self.current_version) <= 0:
+                logger.info(f"Already up to date ({self.current_version}); skipping update")
+                return True
             
-            logger.info("Fetching latest code...")
-            # Pull latest from GitHub
-            subprocess.run(
-                ["git", "pull", "origin", "main"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True
-            )
+            UPDATE_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
             
-            logger.info("Installing dependencies...")
-            # Install/update requirements
-            subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-q", "-r", "requirements.txt"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True
-            )
+            # Output goes straight to the log file so memory use does not grow with pip's verbosity
+            with open(UPDATE_LOG_PATH, 'wb') as log_file:
+                logger.info("Fetching latest code...")
+                # Fetch only the tip of main rather than its full history, then move onto it
+                subprocess.run(
+                    [GIT_EXECUTABLE, "-c", "protocol.version=2", "fetch", "--depth=1", "origin", "main"],
+                    cwd=REPO_PATH,
+                    check=True,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                )
+                subprocess.run(
+                    [GIT_EXECUTABLE, "reset", "--hard", "FETCH_HEAD"],
+                    cwd=REPO_PATH,
+                    check=True,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                )
+                # Drop objects the shallow history no longer needs; a failure here is harmless
+                subprocess.run(
+                    [GIT_EXECUTABLE, "gc", "--prune=now", "--quiet"],
+                    cwd=REPO_PATH,
+                    check=False,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT
+                )
+                
+                # pip re-resolves every requirement even when none changed, so it only
+                # runs when requirements.txt differs from the last successful install
+                req_hash = hashlib.sha256((REPO_PATH / "requirements.txt").read_bytes()).hexdigest()
+                cache = self._read_update_cache()
+                if cache.get('req_hash') == req_hash:
+                    logger.info("Requirements unchanged; skipping dependency install")
+                else:
+                    logger.info("Installing dependencies...")
+                    # Install/update requirements
+                    subprocess.run(
+                        [sys.executable, "-m", "pip", "install", "-q", "-r", "requirements.txt"],
+                        cwd=REPO_PATH,
+                        check=True,
+                        stdout=log_file,
+                        stderr=subprocess.STDOUT
+                    )
+                    cache['req_hash'] = req_hash
+                    self._write_update_cache(cache)
             
             # Save the new version
             if self.latest_version:
@@ -218,26 +439,58 @@ class UpdateChecker:
             logger.info("Update completed successfully")
             return True
         except subprocess.CalledProcessError as e:
-            logger.error(f"Update failed: {e}")
+            logger.error(f"Update failed: {e}\n{self._read_update_log_tail()}")
             return False
         except Exception as e:
             logger.error(f"Unexpected error during update: {e}")
             return False
     
+    @staticmethod
+    def _read_update_log_tail() -> str:
+        """Return the last UPDATE_LOG_TAIL_BYTES of the update log, or '' if it cannot be read."""
+        try:
+            with open(UPDATE_LOG_PATH, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - UPDATE_LOG_TAIL_BYTES))
+                return f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return ''
+    
     @staticmethod
     def get_github_pages_url() -> str:
         """Get the GitHub Pages documentation URL."""
         return GITHUB_PAGES_URL
     
-    def check_for_updates_async(self, callback) -> None:
-        """Check for updates in a separate thread."""
-        def check():
-            try:
-                result = self.check_for_updates()
-                callback(result)
-            except Exception as e:
-                logger.error(f"Async update check failed: {e}")
-                callback((False, None))
-        
-        thread = threading.Thread(target=check, daemon=True)
-        thread.start()
+    def check_for_updates_async(self, callback, force: bool = False) -> None:
+        """
+        Check for updates on a background thread (force skips the cached result)
+        and call callback(result) from that thread when done.
+        A call made while a check is running shares its result instead of starting
+        another, unless force is set and the running check was not forced.
+        """
+        with self._async_lock:
+            pending = self._pending_check
+            if pending is None or pending.done() or (force and not self._pending_force):
+                pending = self._get_async_executor().submit(self._check_for_updates_safely, force)
+                self._pending_check, self._pending_force = pending, force
+        pending.add_done_callback(lambda future: self._deliver_result(callback, future.result()))
+
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        """Return the one-thread pool behind check_for_updates_async, starting it on first use."""
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='update-check')
+        return self._async_executor
+
+    def _check_for_updates_safely(self, force: bool) -> Tuple[bool, Optional[str]]:
+        try:
+            return self.check_for_updates(force)
+        except Exception as e:
+            logger.error(f"Async update check failed: {e}")
+            return False, None
+
+    @staticmethod
+    def _deliver_result(callback, result: Tuple[bool, Optional[str]]):
+        try:
+            callback(result)
+        except Exception as e:
+            logger.error(f"Update check callback failed: {e}")